@@ -0,0 +1,62 @@
+import pandas as pd
+import streamlit as st
+
+from analise import RECOMENDACOES
+
+# 📊 Agregados dos cards e pizzas — uma única passada agrupada por Recomendação.
+# Guarda soma e quantidade de valores válidos por grupo, então médias e contagens
+# saem sem reler o DataFrame.
+
+def _contribuicao(df, colunas):
+    if df.empty:
+        return {}
+    valores = df[list(colunas)].astype('float64').assign(_linhas=1.0)
+    grupos = valores.groupby(df['Recomendação'].astype(str), sort=False).agg(['sum', 'count'])
+    contribuicao = {}
+    for recomendacao, linha in grupos.iterrows():
+        contribuicao[recomendacao] = {
+            'n': int(linha[('_linhas', 'sum')]),
+            'soma': {c: float(linha[(c, 'sum')]) for c in colunas},
+            'validos': {c: int(linha[(c, 'count')]) for c in colunas},
+        }
+    return contribuicao
+
+def _somar(agregados, contribuicao):
+    for recomendacao, parte in contribuicao.items():
+        grupo = agregados['grupos'].setdefault(recomendacao, {
+            'n': 0,
+            'soma': {c: 0.0 for c in agregados['colunas']},
+            'validos': {c: 0 for c in agregados['colunas']},
+        })
+        grupo['n'] += parte['n']
+        for c in agregados['colunas']:
+            grupo['soma'][c] += parte['soma'][c]
+            grupo['validos'][c] += parte['validos'][c]
+
+def calcular_agregados(df, colunas):
+    agregados = {'colunas': tuple(colunas), 'grupos': {}}
+    _somar(agregados, _contribuicao(df, colunas))
+    return agregados
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def agregados_do_dataset(versao, _df, colunas):
+    return calcular_agregados(_df, colunas)
+
+# 🔢 Leituras para os cards
+def total(agregados):
+    return sum(g['n'] for g in agregados['grupos'].values())
+
+def contagem(agregados, recomendacao):
+    grupo = agregados['grupos'].get(recomendacao)
+    return grupo['n'] if grupo else 0
+
+def media(agregados, coluna, casas=2):
+    soma = sum(g['soma'][coluna] for g in agregados['grupos'].values())
+    validos = sum(g['validos'][coluna] for g in agregados['grupos'].values())
+    return round(soma / validos, casas) if validos else float('nan')
+
+def pizza(agregados):
+    # Mesmo formato do value_counts().reset_index() usado nas pizzas
+    contagens = {r: g['n'] for r, g in agregados['grupos'].items() if g['n'] > 0 and r in RECOMENDACOES}
+    dados = sorted(contagens.items(), key=lambda item: -item[1])
+    return pd.DataFrame(dados, columns=['Recomendacao', 'Count'])
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analise import RECOMENDACOES, PARAMETROS_ACOES, PARAMETROS_FIIS
+from armazenamento import NUMERO, SCHEMAS, caminho_preferido, ler_tabela
+from metricas import contar, cronometrar, exportar_metricas
+from publicacao import caminho_atual, versao_atual
+
+# 🔔 Alertas da watchlist: regras (ticker, métrica, operador, valor) indexadas por ticker.
+# A cada atualização só são avaliadas as regras dos tickers cujos dados mudaram, e um alerta
+# dispara quando a condição passa de falsa para verdadeira (ou quando a Recomendação muda).
+# Num lote parcial, as métricas ausentes guardam o último valor e suas regras não são avaliadas.
+
+OPERADORES = ('>', '>=', '<', '<=', '=', 'mudou')
+METRICAS = tuple(dict.fromkeys(
+    c for tipo in SCHEMAS for c, dtype in SCHEMAS[tipo].items() if dtype == NUMERO or c == 'Recomendação'))
+SINONIMOS = {'DY (%)': 'Dividend Yield (%)'}
+
+# 🧾 Regras
+def ler_regras(caminho):
+    # JSON: [{"ticker": "ITSA4", "metrica": "Upside (%)", "operador": ">", "valor": 10}, ...]
+    with open(caminho, encoding='utf-8') as arquivo:
+        regras = json.load(arquivo)
+    for i, regra in enumerate(regras):
+        regra.setdefault('id', f'regra_{i + 1}')
+        regra['metrica'] = SINONIMOS.get(regra['metrica'], regra['metrica'])
+        if regra['metrica'] not in METRICAS:
+            raise ValueError(f"Métrica desconhecida na regra '{regra['id']}': {regra['metrica']}")
+        if regra.get('operador') not in OPERADORES:
+            raise ValueError(f"Operador inválido na regra '{regra['id']}': {regra.get('operador')}")
+    return regras
+
+def regras_padrao(acoes=(), fiis=()):
+    # Os mesmos limites de analise.py, por ticker, mais a mudança de Recomendação
+    p, f = PARAMETROS_ACOES, PARAMETROS_FIIS
+    limites = {
+        'acoes': [('Upside (%)', '>', p['upside_min_compra']), ('Dividend Yield (%)', '>=', p['dy_min_compra']),
+                  ('ROE (%)', '>=', p['roe_min_compra']), ('Upside (%)', '<', p['upside_max_venda'])],
+        'fiis': [('P/VP', '<', f['pvp_max_compra']), ('Dividend Yield (%)', '>', f['dy_min_compra']),
+                 ('Vacância (%)', '<', f['vacancia_max_compra']), ('P/VP', '>', f['pvp_min_venda']),
+                 ('Vacância (%)', '>', f['vacancia_min_venda'])],
+    }
+    regras = []
+    for tipo, tickers in (('acoes', acoes), ('fiis', fiis)):
+        for ticker in tickers:
+            for metrica, operador, valor in limites[tipo] + [('Recomendação', 'mudou', None)]:
+                regras.append({'id': f'{ticker}:{metrica}{operador}{"" if valor is None else valor}',
+                               'ticker': ticker, 'metrica': metrica, 'operador': operador, 'valor': valor})
+    return regras
+
+# 📤 Saídas
+class SaidaConsole:
+    def enviar(self, alertas):
+        for alerta in alertas:
+            print(f"🔔 {alerta['mensagem']}")
+
+class SaidaArquivo:
+    # Uma linha JSON por alerta (append), fácil de seguir com tail -f
+    def __init__(self, caminho='./relatorios/alertas.jsonl'):
+        self.caminho = caminho
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+    def enviar(self, alertas):
+        with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+            for alerta in alertas:
+                arquivo.write(json.dumps(alerta, ensure_ascii=False) + '\n')
+
+class SaidaWebhook:
+    # Stub: monta o payload que iria no POST e guarda em memória (sem rede)
+    def __init__(self, url='http://localhost/alertas'):
+        self.url = url
+        self.enviados = []
+
+    def enviar(self, alertas):
+        if alertas:
+            self.enviados.append({'url': self.url, 'payload': {'alertas': alertas}})
+            print(f"📨 POST {self.url} ({len(alertas)} alertas)")
+
+SAIDAS = {
+    'console': SaidaConsole,
+    'arquivo': SaidaArquivo,
+    'webhook': SaidaWebhook,
+}
+
+# ⚙️ Motor
+class MotorAlertas:
+    def __init__(self, regras, saidas=None):
+        self.saidas = saidas if saidas is not None else [SaidaConsole()]
+        self.metricas = [m for m in METRICAS if any(r['metrica'] == m for r in regras)]
+        coluna = {m: i for i, m in enumerate(self.metricas)}
+
+        # Regras como arrays ordenados por ticker: as regras de um ticker são uma faixa contígua
+        tickers = np.array([str(r['ticker']).upper().removesuffix('.SA') for r in regras], dtype=object)
+        ordem = np.argsort(tickers, kind='stable')
+        self.regras = [regras[i] for i in ordem]
+        self.tickers = tickers[ordem].astype(str)
+        self.coluna = np.array([coluna[r['metrica']] for r in self.regras], dtype=np.int64)
+        self.operador = np.array([OPERADORES.index(r['operador']) for r in self.regras], dtype=np.int64)
+        # Limite no mesmo dtype dos datasets (float32), como em analise._limite: 0.95 não vira "< 0.95"
+        self.limite = np.array([self._limite(r) for r in self.regras], dtype=NUMERO).astype('float64')
+        self.ativa = np.zeros(len(self.regras), dtype=bool)
+        self.anterior = np.full(len(self.regras), np.nan)
+        self.dados = pd.DataFrame(columns=self.metricas, dtype='float64')
+
+    @staticmethod
+    def _limite(regra):
+        # Recomendação é comparada pelo código (Comprar=0, Manter=1, Vender=2)
+        if regra['metrica'] == 'Recomendação':
+            return RECOMENDACOES.index(regra['valor']) if regra.get('valor') in RECOMENDACOES else np.nan
+        return np.nan if regra.get('valor') is None else float(regra['valor'])
+
+    def _preparar(self, df):
+        # Só as métricas presentes no lote: coluna ausente não é valor vazio, é "sem novidade"
+        df = df.rename(columns=SINONIMOS)
+        tabela = pd.DataFrame(index=df['Ticker'].astype(str).str.upper().str.removesuffix('.SA'))
+        for metrica in self.metricas:
+            if metrica not in df.columns:
+                continue
+            if metrica == 'Recomendação':
+                codigos = pd.Categorical(df[metrica], categories=RECOMENDACOES).codes
+                tabela[metrica] = np.where(codigos >= 0, codigos, np.nan)
+            else:
+                tabela[metrica] = df[metrica].to_numpy(dtype='float64', na_value=np.nan)
+        return tabela[~tabela.index.duplicated(keep='last')]
+
+    def _regras_dos(self, tickers):
+        # Posições das regras dos tickers alterados (searchsorted nas faixas já ordenadas)
+        inicio = np.searchsorted(self.tickers, tickers, side='left')
+        fim = np.searchsorted(self.tickers, tickers, side='right')
+        tamanhos = fim - inicio
+        if not tamanhos.sum():
+            return np.empty(0, dtype=np.int64)
+        deslocamento = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+        return np.repeat(inicio, tamanhos) + deslocamento
+
+    def atualizar(self, df, alertar=True):
+        # Recebe um lote (todos os ativos ou só parte) e devolve os alertas disparados;
+        # alertar=False só registra o estado (ex.: primeira leitura, sem alertar o que já era verdade)
+        with cronometrar('alertas_atualizar'):
+            novos = self._preparar(df)
+            # Métricas que faltam no lote mantêm o último valor conhecido
+            combinados = self.dados.reindex(novos.index)
+            antigos = combinados[novos.columns].to_numpy()
+            iguais = (novos.to_numpy() == antigos) | (novos.isna().to_numpy() & np.isnan(antigos))
+            alterados = novos.index[~iguais.all(axis=1)].to_numpy(dtype=str)
+            combinados[novos.columns] = novos
+            self.dados = pd.concat([self.dados.drop(novos.index, errors='ignore'), combinados])
+
+            # Regras dos tickers alterados cuja métrica veio no lote
+            posicoes = self._regras_dos(alterados)
+            no_lote = [self.metricas.index(m) for m in novos.columns]
+            posicoes = posicoes[np.isin(self.coluna[posicoes], no_lote)]
+            contar('alertas_regras_avaliadas_total', len(posicoes))
+            if not len(posicoes):
+                return []
+            linhas = combinados.index.get_indexer(self.tickers[posicoes])
+            valores = combinados.to_numpy()[linhas, self.coluna[posicoes]]
+            anteriores = self.anterior[posicoes]
+            disparou = self._avaliar(posicoes, valores)
+            self.anterior[posicoes] = valores
+            if not alertar:
+                return []
+
+        alertas = [self._alerta(p, v, a) for p, v, a in zip(posicoes[disparou], valores[disparou], anteriores[disparou])]
+        if alertas:
+            contar('alertas_disparados_total', len(alertas))
+            for saida in self.saidas:
+                saida.enviar(alertas)
+        return alertas
+
+    def _avaliar(self, posicoes, valores):
+        operador, limite, anterior = self.operador[posicoes], self.limite[posicoes], self.anterior[posicoes]
+        with np.errstate(invalid='ignore'):
+            condicao = np.select(
+                [operador == 0, operador == 1, operador == 2, operador == 3, operador == 4],
+                [valores > limite, valores >= limite, valores < limite, valores <= limite, valores == limite],
+                default=False,
+            )
+        mudou = (operador == OPERADORES.index('mudou')) & ~np.isnan(anterior) & ~np.isnan(valores) & (valores != anterior)
+        # Limite: só dispara ao cruzar (falsa → verdadeira); 'mudou': a cada mudança de valor
+        disparou = (condicao & ~self.ativa[posicoes]) | mudou
+        self.ativa[posicoes] = condicao
+        return disparou
+
+    def _alerta(self, posicao, valor, anterior):
+        regra = self.regras[posicao]
+
+        def exibir(v):
+            if np.isnan(v):
+                return None
+            return RECOMENDACOES[int(v)] if regra['metrica'] == 'Recomendação' else round(float(v), 2)
+
+        valor_exibido, anterior_exibido = exibir(valor), exibir(anterior)
+        if regra['operador'] == 'mudou':
+            mensagem = f"{self.tickers[posicao]}: {regra['metrica']} mudou de {anterior_exibido} para {valor_exibido}"
+        else:
+            mensagem = f"{self.tickers[posicao]}: {regra['metrica']} = {valor_exibido} ({regra['operador']} {regra['valor']})"
+        return {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'regra': regra['id'],
+            'ticker': self.tickers[posicao],
+            'metrica': regra['metrica'],
+            'operador': regra['operador'],
+            'limite': regra.get('valor'),
+            'valor': valor_exibido,
+            'anterior': anterior_exibido,
+            'mensagem': mensagem,
+        }
+
+# ⏱️ Acompanha a versão publicada pelo atualizador.py: só reavalia quando sai versão nova
+def _caminhos(pasta):
+    caminhos = {tipo: caminho_preferido(caminho_atual(tipo, pasta)) for tipo in ('acoes', 'fiis')}
+    return {tipo: caminho for tipo, caminho in caminhos.items() if os.path.exists(caminho)}
+
+def _versao(pasta):
+    # Sem publicação, os próprios arquivos (pelo mtime) fazem o papel de versão
+    return versao_atual(pasta) or '|'.join(f'{c}:{os.path.getmtime(c)}' for c in _caminhos(pasta).values())
+
+def ler_publicado(pasta='./dados'):
+    partes = [ler_tabela(caminho, tipo) for tipo, caminho in _caminhos(pasta).items()]
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=['Ticker'])
+
+def acompanhar(motor, pasta='./dados', intervalo=60, uma_vez=False, alertar_inicial=False):
+    versao_vista = None
+    primeira = True
+    while True:
+        versao = _versao(pasta)
+        if versao != versao_vista:
+            alertas = motor.atualizar(ler_publicado(pasta), alertar=alertar_inicial or not primeira)
+            print(f"🔄 {datetime.now():%H:%M:%S} {len(alertas)} alertas")
+            versao_vista, primeira = versao, False
+        if uma_vez:
+            return
+        time.sleep(intervalo)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Alertas BG Analista — watchlist de limites e mudanças de Recomendação")
+    parser.add_argument('--regras', help="JSON de regras (padrão: limites do analise.py para todos os ativos)")
+    parser.add_argument('--pasta', default='./dados')
+    parser.add_argument('--saida', nargs='+', choices=list(SAIDAS), default=['console'])
+    parser.add_argument('--intervalo', type=float, default=60, help="segundos entre verificações de versão nova")
+    parser.add_argument('--alertar-inicial', action='store_true', help="alerta também o que já é verdade na primeira leitura")
+    parser.add_argument('--uma-vez', action='store_true')
+    args = parser.parse_args()
+
+    if args.regras:
+        regras = ler_regras(args.regras)
+    else:
+        dados = {tipo: ler_tabela(caminho_atual(tipo, args.pasta), tipo) for tipo in ('acoes', 'fiis')}
+        regras = regras_padrao(dados['acoes']['Ticker'].astype(str), dados['fiis']['Ticker'].astype(str))
+    print(f"📋 {len(regras)} regras")
+
+    motor = MotorAlertas(regras, [SAIDAS[nome]() for nome in args.saida])
+    try:
+        acompanhar(motor, args.pasta, args.intervalo, args.uma_vez, args.alertar_inicial)
+    except KeyboardInterrupt:
+        print("\n⏹️ Alertas interrompidos.")
+    print(f"📊 Métricas: {', '.join(exportar_metricas(nome='alertas'))}")
@@ -1,7 +1,77 @@
-def gerar_recomendacao(row):
-    if row['Upside (%)'] > 10 and row['DY (%)'] >= 6 and row['ROE (%)'] >= 15:
+import numpy as np
+import pandas as pd
+
+from metricas import cronometrar
+
+RECOMENDACOES = ['Comprar', 'Manter', 'Vender']
+
+# ⚙️ Parâmetros das regras (Buffett/Graham para ações, regras de FIIs)
+PARAMETROS_ACOES = {
+    'upside_min_compra': 10,
+    'dy_min_compra': 6,
+    'roe_min_compra': 15,
+    'upside_max_venda': -5,
+}
+
+PARAMETROS_FIIS = {
+    'pvp_max_compra': 0.95,
+    'dy_min_compra': 9,
+    'vacancia_max_compra': 5,
+    'pvp_min_venda': 1.10,
+    'vacancia_min_venda': 10,
+}
+
+def gerar_recomendacao(row, coluna_dy='DY (%)', parametros=None):
+    # Uma linha por vez (relatório em streaming) com as mesmas regras de classificar_acoes
+    p = {**PARAMETROS_ACOES, **(parametros or {})}
+    if row['Upside (%)'] > p['upside_min_compra'] and row[coluna_dy] >= p['dy_min_compra'] and row['ROE (%)'] >= p['roe_min_compra']:
         return 'Comprar'
-    elif row['Upside (%)'] < -5:
+    elif row['Upside (%)'] < p['upside_max_venda']:
         return 'Vender'
     else:
         return 'Manter'
+
+# 🔥 Motor vetorizado — avalia as regras como máscaras sobre colunas inteiras
+def _classificar(comprar, vender, index):
+    # Comprar tem prioridade sobre Vender, o resto é Manter (mesma ordem dos if/elif)
+    codigos = np.where(comprar, 0, np.where(vender, 2, 1))
+    return pd.Series(pd.Categorical.from_codes(codigos, categories=RECOMENDACOES), index=index)
+
+def _valores(df, coluna):
+    # Mantém float32 quando a coluna já vem compacta (ver armazenamento.py)
+    valores = df[coluna].to_numpy()
+    return valores if valores.dtype == np.float32 else valores.astype(float)
+
+def _limite(valores, limite):
+    # Limite no mesmo dtype da coluna: 0.95 em float32 não pode virar "< 0.95"
+    return valores.dtype.type(limite)
+
+def classificar_acoes(df, coluna_dy='DY (%)', parametros=None):
+    with cronometrar('analise_classificar_acoes'):
+        p = {**PARAMETROS_ACOES, **(parametros or {})}
+        upside = _valores(df, 'Upside (%)')
+        dy = _valores(df, coluna_dy)
+        roe = _valores(df, 'ROE (%)')
+
+        comprar = (
+            (upside > _limite(upside, p['upside_min_compra']))
+            & (dy >= _limite(dy, p['dy_min_compra']))
+            & (roe >= _limite(roe, p['roe_min_compra']))
+        )
+        vender = upside < _limite(upside, p['upside_max_venda'])
+        return _classificar(comprar, vender, df.index)
+
+def classificar_fiis(df, parametros=None):
+    with cronometrar('analise_classificar_fiis'):
+        p = {**PARAMETROS_FIIS, **(parametros or {})}
+        pvp = _valores(df, 'P/VP')
+        dy = _valores(df, 'Dividend Yield (%)')
+        vacancia = _valores(df, 'Vacância (%)')
+
+        comprar = (
+            (pvp < _limite(pvp, p['pvp_max_compra']))
+            & (dy > _limite(dy, p['dy_min_compra']))
+            & (vacancia < _limite(vacancia, p['vacancia_max_compra']))
+        )
+        vender = (pvp > _limite(pvp, p['pvp_min_venda'])) | (vacancia > _limite(vacancia, p['vacancia_min_venda']))
+        return _classificar(comprar, vender, df.index)
@@ -0,0 +1,113 @@
+import os
+import sys
+
+import pandas as pd
+
+from analise import RECOMENDACOES
+from metricas import cronometrar
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    PARQUET_DISPONIVEL = False
+
+# 📐 Schema explícito dos datasets em ./dados/
+TEXTO = 'category'
+NUMERO = 'float32'
+
+SCHEMAS = {
+    'acoes': {
+        'Ticker': TEXTO,
+        'P/L': NUMERO,
+        'ROE (%)': NUMERO,
+        'ROIC (%)': NUMERO,
+        'Dividend Yield (%)': NUMERO,
+        'DY (%)': NUMERO,
+        'Margem Líquida (%)': NUMERO,
+        'Upside (%)': NUMERO,
+        'Preço Atual': NUMERO,
+        'Preço Justo': NUMERO,
+        'LPA': NUMERO,
+        'VPA': NUMERO,
+        'Dividendo por Ação': NUMERO,
+        'FCF por Ação': NUMERO,
+        'Recomendação': TEXTO,
+    },
+    'fiis': {
+        'Ticker': TEXTO,
+        'Setor': TEXTO,
+        'Preço Atual': NUMERO,
+        'P/VP': NUMERO,
+        'Dividend Yield (%)': NUMERO,
+        'Vacância (%)': NUMERO,
+        'Renda Mensal (R$)': NUMERO,
+        'Recomendação': TEXTO,
+    },
+}
+
+def aplicar_schema(df, tipo):
+    for coluna, dtype in SCHEMAS[tipo].items():
+        if coluna not in df.columns:
+            continue
+        if coluna == 'Recomendação':
+            df[coluna] = pd.Categorical(df[coluna], categories=RECOMENDACOES)
+        elif dtype == NUMERO:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(NUMERO)
+        else:
+            df[coluna] = df[coluna].astype(dtype)
+    return df
+
+def caminho_parquet(caminho):
+    return os.path.splitext(caminho)[0] + '.parquet'
+
+def caminho_preferido(caminho):
+    # Usa o .parquet ao lado do .csv quando existir (e o pyarrow estiver instalado) e não for mais
+    # velho que o CSV — um CSV editado ou trocado à mão depois da conversão vence o .parquet antigo
+    parquet = caminho_parquet(caminho)
+    if PARQUET_DISPONIVEL and os.path.exists(parquet):
+        if not os.path.exists(caminho) or os.path.getmtime(parquet) >= os.path.getmtime(caminho):
+            return parquet
+    return caminho
+
+def mtimes(caminho):
+    # mtime do .csv e do .parquet irmão (None se não existir): chave de cache que muda se qualquer um mudar
+    return tuple(os.path.getmtime(c) if os.path.exists(c) else None
+                 for c in dict.fromkeys((caminho, caminho_parquet(caminho))))
+
+# 📄 Leitura: Parquet com memory map, CSV como fallback
+def ler_tabela(caminho, tipo):
+    if caminho.endswith('.parquet'):
+        df = pd.read_parquet(caminho, memory_map=True)
+    else:
+        df = pd.read_csv(caminho)
+    return aplicar_schema(df, tipo)
+
+def salvar_tabela(df, caminho, tipo):
+    # Grava em arquivo temporário e troca de uma vez: quem lê nunca vê arquivo pela metade
+    df = aplicar_schema(df.copy(), tipo)
+    pasta, nome = os.path.split(caminho)
+    temporario = os.path.join(pasta, f'.tmp_{nome}')
+    with cronometrar('armazenamento_salvar_tabela'):
+        if caminho.endswith('.parquet'):
+            df.to_parquet(temporario, index=False, compression='zstd')
+        else:
+            df.to_csv(temporario, index=False)
+        os.replace(temporario, caminho)
+
+# 🔄 Importação do layout CSV atual para Parquet
+def importar_csv(pasta='./dados'):
+    if not PARQUET_DISPONIVEL:
+        raise RuntimeError("pyarrow não está instalado — instale com 'pip install pyarrow'.")
+    convertidos = []
+    for tipo in SCHEMAS:
+        caminho = os.path.join(pasta, f'{tipo}.csv')
+        if os.path.exists(caminho):
+            salvar_tabela(pd.read_csv(caminho), caminho_parquet(caminho), tipo)
+            convertidos.append(caminho_parquet(caminho))
+    return convertidos
+
+if __name__ == '__main__':
+    pasta = sys.argv[1] if len(sys.argv) > 1 else './dados'
+    for caminho in importar_csv(pasta):
+        print(f"✅ Gerado {caminho}")
@@ -0,0 +1,53 @@
+import argparse
+import time
+from datetime import datetime
+
+from metricas import ativar_perfil, exportar_metricas
+from publicacao import MANTER_VERSOES, publicar_versao
+from screener import coletar_universo
+
+# ⏱️ Atualizador em segundo plano: um único processo coleta e classifica o universo em intervalo fixo
+# e publica uma versão nova. Os dashboards só leem a última versão, então a carga na API não depende
+# de quantos usuários estão conectados e a página não espera a coleta.
+
+def rodar_ciclo(simbolos, pasta, idade_max, workers, manter=MANTER_VERSOES):
+    tabelas = coletar_universo(simbolos, idade_max, workers, pasta=pasta)
+    if not tabelas:
+        print("⚠️ Nada coletado — a versão publicada anterior continua valendo.")
+        return None
+    versao = publicar_versao(tabelas, pasta, manter)
+    print(f"📦 Versão {versao} publicada ({', '.join(f'{t}: {len(df)}' for t, df in tabelas.items())})")
+    return versao
+
+def rodar_atualizador(simbolos, pasta='./dados', intervalo=30 * 60, workers=16, manter=MANTER_VERSOES, uma_vez=False):
+    proximo = time.monotonic()
+    while True:
+        print(f"\n===== ATUALIZAÇÃO {datetime.now():%d/%m/%Y %H:%M:%S} =====")
+        try:
+            # Reaproveita do cache o que foi coletado há menos de um intervalo
+            rodar_ciclo(simbolos, pasta, intervalo, workers, manter)
+        except Exception as e:
+            print(f"❌ Falha no ciclo: {e}")
+        if uma_vez:
+            return
+        # Intervalo fixo a partir do início do ciclo (um ciclo lento não acumula atraso)
+        proximo += intervalo
+        time.sleep(max(0.0, proximo - time.monotonic()))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Atualizador BG Analista — publica o universo em intervalo fixo")
+    parser.add_argument('--simbolos', default='./dados/ativos_b3.csv', help="CSV com colunas Ticker,Tipo (acao/fii)")
+    parser.add_argument('--pasta', default='./dados', help="pasta onde a versão é publicada (em <pasta>/publicado)")
+    parser.add_argument('--intervalo-minutos', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--manter', type=int, default=MANTER_VERSOES, help="quantas versões antigas manter")
+    parser.add_argument('--uma-vez', action='store_true', help="roda um ciclo e sai (ex.: agendado pelo cron)")
+    parser.add_argument('--perfil', action='store_true', help="grava um cProfile da etapa mais lenta")
+    args = parser.parse_args()
+    ativar_perfil(args.perfil)
+
+    try:
+        rodar_atualizador(args.simbolos, args.pasta, args.intervalo_minutos * 60, args.workers, args.manter, args.uma_vez)
+    except KeyboardInterrupt:
+        print("\n⏹️ Atualizador interrompido.")
+    print(f"📊 Métricas: {', '.join(exportar_metricas(nome='atualizador'))}")
@@ -0,0 +1,141 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from analise import RECOMENDACOES, classificar_acoes, classificar_fiis
+from cenarios import ler_cenarios, tipo_do_arquivo
+from historico import PASTA_HISTORICO, ler_historico
+
+# 📈 Backtest vetorizado das regras: fundamentos datados × preços diários numa matriz data × ticker.
+# Fundamentos (formato longo): Data, Ticker + colunas das regras (mesmas de acoes.csv / fiis.csv).
+
+HORIZONTES = (21, 63, 252)  # ~1 mês, 1 trimestre, 1 ano em pregões
+
+COLUNAS_REGRAS = {
+    'acoes': ('Upside (%)', 'Dividend Yield (%)', 'ROE (%)'),
+    'fiis': ('P/VP', 'Dividend Yield (%)', 'Vacância (%)'),
+}
+
+def ler_arquivo(caminho):
+    df = pd.read_parquet(caminho) if caminho.endswith('.parquet') else pd.read_csv(caminho)
+    df['Data'] = pd.to_datetime(df['Data'])
+    return df
+
+def carregar_precos(tickers, pasta=PASTA_HISTORICO):
+    # Fechamento ajustado de cada ticker do histórico local (historico.py), em formato largo
+    series = {}
+    for ticker in tickers:
+        historico = ler_historico(ticker, pasta=pasta)
+        if historico.empty:
+            historico = ler_historico(f'{ticker}.SA', pasta=pasta)
+        if not historico.empty:
+            coluna = 'Fechamento Ajustado' if 'Fechamento Ajustado' in historico.columns else 'Fechamento'
+            series[ticker] = historico.set_index('Data')[coluna].astype('float64')
+    return pd.DataFrame(series).sort_index()
+
+def precos_de_arquivo(caminho):
+    # Formato longo: Data, Ticker, Fechamento
+    return ler_arquivo(caminho).pivot_table(index='Data', columns='Ticker', values='Fechamento').sort_index()
+
+def montar_matrizes(fundamentos, precos, tipo):
+    # Fundamentos "as-of": cada pregão usa o último snapshot conhecido até aquela data
+    fundamentos = fundamentos.rename(columns={'DY (%)': 'Dividend Yield (%)'})
+    tickers = precos.columns.intersection(fundamentos['Ticker'].unique())
+    datas = precos.index
+    matrizes = {}
+    for coluna in COLUNAS_REGRAS[tipo]:
+        largo = fundamentos.pivot_table(index='Data', columns='Ticker', values=coluna, aggfunc='last')
+        largo = largo.reindex(columns=tickers)
+        matrizes[coluna] = largo.reindex(largo.index.union(datas)).ffill().reindex(datas).to_numpy()
+    return matrizes, precos[tickers]
+
+def classificar_matriz(matrizes, tipo, parametros=None):
+    # Achata a matriz data × ticker em colunas e usa o mesmo motor de analise.py
+    formato = next(iter(matrizes.values())).shape
+    plano = pd.DataFrame({coluna: m.ravel() for coluna, m in matrizes.items()})
+    if tipo == 'acoes':
+        codigos = classificar_acoes(plano, coluna_dy='Dividend Yield (%)', parametros=parametros).cat.codes
+    else:
+        codigos = classificar_fiis(plano, parametros=parametros).cat.codes
+    codigos = codigos.to_numpy().reshape(formato)
+    # Sem fundamentos ainda (antes do primeiro snapshot) não há sinal
+    sem_dados = np.isnan(np.stack(list(matrizes.values()))).all(axis=0)
+    return np.where(sem_dados, -1, codigos)
+
+def retornos_futuros(precos, horizonte):
+    valores = precos.to_numpy()
+    futuro = np.full_like(valores, np.nan)
+    futuro[:-horizonte] = valores[horizonte:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return futuro / valores - 1
+
+def avaliar(sinais, precos, horizontes=HORIZONTES):
+    linhas = []
+    for horizonte in horizontes:
+        retorno = retornos_futuros(precos, horizonte)
+        medias = {}
+        for codigo, recomendacao in enumerate(RECOMENDACOES):
+            amostra = retorno[(sinais == codigo) & ~np.isnan(retorno)]
+            medias[recomendacao] = amostra.mean() * 100 if amostra.size else np.nan
+            linhas.append({
+                'Horizonte (pregões)': horizonte,
+                'Recomendação': recomendacao,
+                'Observações': int(amostra.size),
+                'Retorno Médio (%)': round(medias[recomendacao], 3),
+                'Retorno Mediano (%)': round(np.median(amostra) * 100, 3) if amostra.size else np.nan,
+                'Acerto (%)': round((amostra > 0).mean() * 100, 1) if amostra.size else np.nan,
+            })
+        linhas.append({
+            'Horizonte (pregões)': horizonte,
+            'Recomendação': 'Comprar − Vender',
+            'Observações': None,
+            'Retorno Médio (%)': round(medias['Comprar'] - medias['Vender'], 3),
+            'Retorno Mediano (%)': np.nan,
+            'Acerto (%)': np.nan,
+        })
+    return pd.DataFrame(linhas)
+
+def rodar_backtest(fundamentos, precos, tipo=None, parametros=None, horizontes=HORIZONTES):
+    tipo = tipo or tipo_do_arquivo(fundamentos)
+    matrizes, precos = montar_matrizes(fundamentos, precos, tipo)
+    return avaliar(classificar_matriz(matrizes, tipo, parametros), precos, horizontes)
+
+def varrer_parametros(fundamentos, precos, cenarios, tipo=None, horizontes=HORIZONTES):
+    # Monta as matrizes uma vez e só reclassifica a cada cenário (mesmo formato do cenarios.py)
+    tipo = tipo or tipo_do_arquivo(fundamentos)
+    matrizes, precos = montar_matrizes(fundamentos, precos, tipo)
+    resultados = []
+    for i, cenario in enumerate(cenarios):
+        resultado = avaliar(classificar_matriz(matrizes, tipo, cenario.get(tipo)), precos, horizontes)
+        resultado.insert(0, 'Cenário', cenario.get('nome', f'cenario_{i + 1}'))
+        resultados.append(resultado)
+    return pd.concat(resultados, ignore_index=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Backtest das regras de recomendação (retornos futuros por balde)")
+    parser.add_argument('fundamentos', help="CSV/Parquet longo com Data, Ticker e as colunas das regras")
+    parser.add_argument('--precos', help="CSV/Parquet longo com Data, Ticker, Fechamento (padrão: dados/historico)")
+    parser.add_argument('--cenarios', help="JSON de cenários (mesmo formato do cenarios.py) para varredura")
+    parser.add_argument('--horizontes', type=int, nargs='+', default=list(HORIZONTES))
+    parser.add_argument('--saida', default='./relatorios/backtest.csv')
+    args = parser.parse_args()
+
+    fundamentos = ler_arquivo(args.fundamentos)
+    if args.precos:
+        precos = precos_de_arquivo(args.precos)
+    else:
+        precos = carregar_precos(fundamentos['Ticker'].unique())
+    tipo = tipo_do_arquivo(fundamentos)
+
+    if args.cenarios:
+        cenarios = ler_cenarios(args.cenarios)
+        resultado = varrer_parametros(fundamentos, precos, cenarios, tipo, args.horizontes)
+    else:
+        resultado = rodar_backtest(fundamentos, precos, tipo, horizontes=args.horizontes)
+
+    os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+    resultado.to_csv(args.saida, index=False)
+    print(resultado.to_string(index=False))
+    print(f"\n✅ Salvo em {args.saida}")
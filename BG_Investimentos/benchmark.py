@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analise import classificar_acoes, classificar_fiis, gerar_recomendacao
+from coleta_dados import obter_dados, obter_dados_em_lote
+from provedores import definir_provedor
+
+# 🧪 Provedor falso com latência configurável — o benchmark nunca acessa a rede
+LATENCIA = {'segundos': 0.0}
+
+class ProvedorFalso:
+    nome = 'falso'
+
+    def _registro(self, ticker):
+        time.sleep(LATENCIA['segundos'])
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        return {
+            'currentPrice': float(rng.uniform(5, 100)),
+            'trailingPE': float(rng.uniform(3, 30)),
+            'dividendYield': float(rng.uniform(0, 0.15)),
+            'returnOnEquity': float(rng.uniform(0, 0.35)),
+            'profitMargins': float(rng.uniform(0, 0.4)),
+            'trailingEps': float(rng.normal(3, 3)),
+            'bookValue': float(rng.uniform(1, 50)),
+            'dividendRate': float(rng.uniform(0, 5)),
+            'freeCashflow': float(rng.normal(2e9, 3e9)),
+            'sharesOutstanding': float(rng.uniform(1e8, 5e9)),
+        }
+
+    def cotacao(self, ticker):
+        return self._registro(ticker)['currentPrice']
+
+    def fundamentos(self, ticker, campos):
+        registro = self._registro(ticker)
+        return {campo: registro.get(campo) for campo in campos}
+
+definir_provedor(ProvedorFalso())
+
+SETORES = ['Logístico', 'Papel', 'Escritórios', 'Shoppings', 'Híbrido']
+
+# 🎲 Universos sintéticos no formato de dados/acoes.csv e dados/fiis.csv
+def gerar_universo_acoes(n, semente=42):
+    rng = np.random.default_rng(semente)
+    preco = rng.uniform(5, 100, n).round(2)
+    upside = rng.normal(5, 12, n).round(2)
+    return pd.DataFrame({
+        'Ticker': [f'ACAO{i}' for i in range(n)],
+        'P/L': rng.uniform(3, 30, n).round(2),
+        'ROE (%)': rng.uniform(0, 35, n).round(2),
+        'Dividend Yield (%)': rng.uniform(0, 15, n).round(2),
+        'Upside (%)': upside,
+        'Preço Atual': preco,
+        'Preço Justo': (preco * (1 + upside / 100)).round(2),
+    })
+
+def gerar_universo_fiis(n, semente=42):
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        'Ticker': [f'FII{i}11' for i in range(n)],
+        'Setor': rng.choice(SETORES, n),
+        'P/VP': rng.uniform(0.7, 1.3, n).round(2),
+        'Dividend Yield (%)': rng.uniform(5, 14, n).round(2),
+        'Vacância (%)': rng.uniform(0, 15, n).round(2),
+        'Renda Mensal (R$)': rng.uniform(0.5, 2.5, n).round(2),
+    })
+
+# ⏱️ Medição: tempo por repetição, throughput e pico de memória
+def pico_memoria(funcao):
+    # Passada separada só para a memória: com o tracemalloc ligado cada alocação fica mais lenta
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def medir(funcao, linhas, repeticoes):
+    # Tempos sem tracemalloc (p50/p99 limpos); o pico de memória vem de uma passada a mais
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return resumir(tempos, linhas, pico_memoria(funcao))
+
+def resumir(tempos, linhas, pico):
+    tempos = np.array(tempos)
+    return {
+        'linhas': linhas,
+        'p50_s': float(np.percentile(tempos, 50)),
+        'p99_s': float(np.percentile(tempos, 99)),
+        'throughput_linhas_s': float(linhas / np.median(tempos)) if np.median(tempos) else None,
+        'pico_memoria_mb': round(pico / 1024 ** 2, 3),
+    }
+
+def medir_coleta(n, max_workers):
+    # Latência medida por ticker (cada chamada a obter_dados)
+    latencias = []
+
+    def coletor(ticker):
+        inicio = time.perf_counter()
+        dados = obter_dados(ticker)
+        latencias.append(time.perf_counter() - inicio)
+        return dados
+
+    tickers = [f'ACAO{i}.SA' for i in range(n)]
+    inicio = time.perf_counter()
+    obter_dados_em_lote(tickers, max_workers=max_workers, coletor=coletor)
+    total = time.perf_counter() - inicio
+    tempos = list(latencias)
+    pico = pico_memoria(lambda: obter_dados_em_lote(tickers, max_workers=max_workers, coletor=coletor))
+
+    resultado = resumir(tempos, n, pico)
+    resultado['throughput_linhas_s'] = n / total if total else None
+    resultado['total_s'] = total
+    return resultado
+
+def rodar(tamanhos, repeticoes, latencia, max_coleta, max_workers, max_excel, max_apply):
+    LATENCIA['segundos'] = latencia
+    resultados = []
+    pasta = tempfile.mkdtemp(prefix='bg_benchmark_')
+
+    for n in tamanhos:
+        print(f"▶️ {n} linhas")
+        acoes = gerar_universo_acoes(n)
+        fiis = gerar_universo_fiis(n)
+        registros = acoes.rename(columns={'Dividend Yield (%)': 'DY (%)'}).to_dict('records')
+        etapas = {}
+
+        n_coleta = min(n, max_coleta)
+        etapas['coleta'] = medir_coleta(n_coleta, max_workers)
+        etapas['dataframe'] = medir(lambda: pd.DataFrame(registros), n, repeticoes)
+        etapas['recomendacao_acoes'] = medir(
+            lambda: classificar_acoes(acoes, coluna_dy='Dividend Yield (%)'), n, repeticoes)
+        etapas['recomendacao_fiis'] = medir(lambda: classificar_fiis(fiis), n, repeticoes)
+        if n <= max_apply:
+            base = pd.DataFrame(registros)
+            etapas['recomendacao_apply'] = medir(
+                lambda: base.apply(gerar_recomendacao, axis=1), n, repeticoes)
+
+        acoes['Recomendação'] = classificar_acoes(acoes, coluna_dy='Dividend Yield (%)')
+        etapas['export_csv'] = medir(
+            lambda: acoes.to_csv(os.path.join(pasta, 'acoes.csv'), index=False), n, repeticoes)
+        try:
+            import pyarrow  # noqa: F401
+            etapas['export_parquet'] = medir(
+                lambda: acoes.to_parquet(os.path.join(pasta, 'acoes.parquet'), index=False), n, repeticoes)
+        except ImportError:
+            pass
+        if n <= max_excel:
+            etapas['export_excel'] = medir(
+                lambda: acoes.to_excel(os.path.join(pasta, 'acoes.xlsx'), index=False), n, 1)
+
+        for etapa, r in etapas.items():
+            print(f"   {etapa:<22} p50={r['p50_s']:.4f}s p99={r['p99_s']:.4f}s "
+                  f"{r['throughput_linhas_s'] or 0:,.0f} linhas/s pico={r['pico_memoria_mb']} MB")
+        resultados.append({'tamanho': n, 'etapas': etapas})
+
+    return resultados
+
+# 👥 Sessões simultâneas: memória com 1..N sessões lendo o mesmo dataset (visão compartilhada × cópia por sessão)
+def medir_sessoes(n, sessoes):
+    from armazenamento import salvar_tabela
+    from carregamento import carregar_arquivo
+    from tabelas import filtrar, indices_do_dataset
+
+    pasta = tempfile.mkdtemp(prefix='bg_benchmark_')
+    caminho = os.path.join(pasta, 'acoes.parquet')
+    salvar_tabela(gerar_universo_acoes(n), caminho, 'acoes')
+    rng = np.random.default_rng(0)
+
+    resultado = {'linhas': n}
+    for modo, carregar in (('compartilhado', lambda: carregar_arquivo(caminho, 'acoes')),
+                           ('copia_por_sessao', lambda: carregar_arquivo(caminho, 'acoes').copy())):
+        def abrir_sessao():
+            # Cada sessão guarda seu DataFrame e o resultado de um filtro próprio (posições)
+            df = carregar()
+            indices = indices_do_dataset(df.attrs['versao'], df)
+            filtro = {'Recomendação': list(rng.choice(['Comprar', 'Manter', 'Vender'], 2, replace=False))}
+            return df, filtrar(df, indices, filtro, busca=f'ACAO{rng.integers(10)}')
+
+        abrir_sessao()  # aquece o cache do processo (leitura + Recomendação + índices)
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        abertas, medidas = [], {}
+        for alvo in sorted(sessoes):
+            while len(abertas) < alvo:
+                abertas.append(abrir_sessao())
+            medidas[alvo] = round((tracemalloc.get_traced_memory()[0] - base) / 1024 ** 2, 3)
+        tracemalloc.stop()
+        resultado[modo] = medidas
+        print(f"   {modo:<18} " + '  '.join(f"{alvo} sessões={mb} MB" for alvo, mb in medidas.items()))
+    return resultado
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline BG Analista com universos sintéticos")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[100, 1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--latencia', type=float, default=0.05, help="latência do yfinance falso (segundos)")
+    parser.add_argument('--max-coleta', type=int, default=500, help="limite de tickers na etapa de coleta")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-excel', type=int, default=10_000)
+    parser.add_argument('--max-apply', type=int, default=100_000, help="limite para medir o df.apply antigo")
+    parser.add_argument('--sessoes', type=int, nargs='+',
+                        help="mede só a memória com N sessões simultâneas (ex.: --sessoes 1 10 50)")
+    parser.add_argument('--saida', default='./benchmarks')
+    args = parser.parse_args()
+
+    if args.sessoes:
+        resultados = []
+        for n in args.tamanhos:
+            print(f"▶️ {n} linhas")
+            resultados.append(medir_sessoes(n, args.sessoes))
+    else:
+        resultados = rodar(args.tamanhos, args.repeticoes, args.latencia,
+                           args.max_coleta, args.workers, args.max_excel, args.max_apply)
+
+    os.makedirs(args.saida, exist_ok=True)
+    caminho = os.path.join(args.saida, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'parametros': vars(args),
+            'resultados': resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f"\n✅ Resultados salvos em {caminho}")
@@ -1,28 +1,59 @@
-import pandas as pd
-from coleta_dados import obter_dados
+import argparse
+from functools import partial
+from coleta_dados import iterar_dados_em_ordem
+from cache_dados import obter_dados_com_cache, aguardar_revalidacoes
 from analise import gerar_recomendacao
+from relatorio import abrir_relatorio
+from execucoes import abrir_execucao, listar_execucoes, diferenca
+from metricas import ativar_perfil, cronometrar, exportar_metricas, perfilar_threads
 
 # ✅ Lista de ativos
 ativos = ['ITSA4.SA', 'WEGE3.SA', 'TAEE11.SA', 'HGLG11.SA', 'MXRF11.SA']
 
-# ✅ Coletar dados
-dados = []
-for ticker in ativos:
-    try:
-        dados.append(obter_dados(ticker))
-    except Exception as e:
-        print(f"Erro ao obter dados de {ticker}: {e}")
+# ✅ Opções de linha de comando
+parser = argparse.ArgumentParser(description="BG Analista — relatório de ações e FIIs")
+parser.add_argument('--atualizar', action='store_true', help="ignora o cache e baixa os dados novamente")
+parser.add_argument('--saida', default='./relatorios/relatorio_bg_analista.xlsx',
+                    help="arquivo do relatório (.xlsx, .csv ou .parquet)")
+parser.add_argument('--perfil', action='store_true',
+                    help="grava um cProfile da etapa mais lenta e outro somando as threads da coleta")
+args = parser.parse_args()
+ativar_perfil(args.perfil)
 
-# ✅ Criar DataFrame
-df = pd.DataFrame(dados)
+# ✅ Coletar (em paralelo, com cache), classificar e gravar cada ativo na ordem da lista
+coletor = perfilar_threads(partial(obter_dados_com_cache, forcar_atualizacao=args.atualizar))
 
-# ✅ Aplicar análise
-df['Recomendação'] = df.apply(gerar_recomendacao, axis=1)
-
-# ✅ Exibir no console
 print("\n===== RELATÓRIO BG ANALISTA =====")
-print(df)
+anteriores = listar_execucoes()
+total = 0
+# Relatório e snapshot recebem as linhas na ordem da lista de ativos — nada fica acumulado em memória
+with cronometrar('bg_analista_coleta_relatorio'), abrir_relatorio(args.saida) as relatorio, abrir_execucao() as snapshot:
+    for _, ticker, dados, e in iterar_dados_em_ordem(ativos, coletor=coletor):
+        if e is not None:
+            print(f"Erro ao obter dados de {ticker}: {e}")
+            continue
+
+        # ✅ Aplicar análise
+        dados['Recomendação'] = gerar_recomendacao(dados)
+
+        # ✅ Exibir no console e salvar no relatório
+        print(f"{ticker:<12} {dados['Recomendação']:<8} Upside {dados['Upside (%)']}%  DY {dados['DY (%)']}%  ROE {dados['ROE (%)']}%")
+        relatorio.escrever(dados)
+        snapshot.escrever(dados)
+        total += 1
+
+print(f"\nRelatório salvo em {args.saida} ({total} ativos)")
+
+# 🗂️ Snapshot imutável da execução + o que mudou desde a anterior
+execucao = snapshot.execucao
+if execucao:
+    print(f"Execução gravada: {execucao}")
+    if anteriores:
+        mudancas = diferenca(anteriores[-1], execucao, somente_mudancas=True)
+        print(f"\n===== O QUE MUDOU desde {anteriores[-1]} =====")
+        print(mudancas.to_string(index=False) if not mudancas.empty else "Nenhuma mudança de recomendação.")
+
+aguardar_revalidacoes()
 
-# ✅ Salvar no Excel
-df.to_excel('./relatorios/relatorio_bg_analista.xlsx', index=False)
-print("\nRelatório salvo na pasta relatorios")
+# 📊 Métricas da execução (JSON + Prometheus, e .prof com --perfil)
+print(f"Métricas salvas em {', '.join(exportar_metricas(nome='bg_analista'))}")
@@ -0,0 +1,107 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from coleta_dados import obter_dados
+from metricas import contar
+
+# ⚙️ Configuração do cache de fundamentos
+CAMINHO_CACHE = './dados/cache_fundamentos.sqlite'
+TTL_PADRAO = 24 * 60 * 60          # dados "frescos" por 1 dia
+JANELA_OBSOLETA = 7 * 24 * 60 * 60  # até 7 dias além do TTL: devolve e revalida em segundo plano
+MAX_ENTRADAS = 5000                # acima disso, remove os menos acessados
+
+_revalidando = set()
+_trava_revalidacao = threading.Lock()
+_threads_revalidacao = []
+
+# 🔌 Conexão (uma por chamada, segura para uso entre threads)
+def _conectar(caminho):
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.execute(
+        """CREATE TABLE IF NOT EXISTS fundamentos (
+            ticker TEXT PRIMARY KEY,
+            dados TEXT NOT NULL,
+            atualizado_em REAL NOT NULL,
+            acessado_em REAL NOT NULL
+        )"""
+    )
+    return conexao
+
+def ler_cache(ticker, caminho=CAMINHO_CACHE):
+    # Retorna (dados, idade_em_segundos) ou (None, None)
+    with _conectar(caminho) as conexao:
+        linha = conexao.execute(
+            "SELECT dados, atualizado_em FROM fundamentos WHERE ticker = ?", (ticker,)
+        ).fetchone()
+        if linha is None:
+            return None, None
+        agora = time.time()
+        conexao.execute("UPDATE fundamentos SET acessado_em = ? WHERE ticker = ?", (agora, ticker))
+    return json.loads(linha[0]), agora - linha[1]
+
+def salvar_cache(ticker, dados, caminho=CAMINHO_CACHE, max_entradas=MAX_ENTRADAS):
+    agora = time.time()
+    with _conectar(caminho) as conexao:
+        conexao.execute(
+            "INSERT OR REPLACE INTO fundamentos (ticker, dados, atualizado_em, acessado_em) VALUES (?, ?, ?, ?)",
+            (ticker, json.dumps(dados, ensure_ascii=False), agora, agora)
+        )
+        # 🧹 Limite de tamanho: remove os menos acessados recentemente
+        conexao.execute(
+            """DELETE FROM fundamentos WHERE ticker IN (
+                SELECT ticker FROM fundamentos ORDER BY acessado_em DESC LIMIT -1 OFFSET ?
+            )""",
+            (max_entradas,)
+        )
+
+def limpar_cache(caminho=CAMINHO_CACHE):
+    with _conectar(caminho) as conexao:
+        conexao.execute("DELETE FROM fundamentos")
+
+def _revalidar(ticker, coletor, caminho):
+    try:
+        salvar_cache(ticker, coletor(ticker), caminho)
+    except Exception:
+        pass  # mantém o valor antigo; tenta de novo na próxima leitura
+    finally:
+        with _trava_revalidacao:
+            _revalidando.discard(ticker)
+
+def _agendar_revalidacao(ticker, coletor, caminho):
+    with _trava_revalidacao:
+        if ticker in _revalidando:
+            return
+        _revalidando.add(ticker)
+    thread = threading.Thread(target=_revalidar, args=(ticker, coletor, caminho), daemon=True)
+    _threads_revalidacao.append(thread)
+    thread.start()
+
+def aguardar_revalidacoes():
+    # Útil em scripts: espera as atualizações em segundo plano antes de sair
+    while _threads_revalidacao:
+        _threads_revalidacao.pop().join()
+
+# 🔥 obter_dados com cache em disco
+def obter_dados_com_cache(ticker, ttl=TTL_PADRAO, forcar_atualizacao=False,
+                          coletor=obter_dados, caminho=CAMINHO_CACHE):
+    if not forcar_atualizacao:
+        dados, idade = ler_cache(ticker, caminho)
+        if dados is not None:
+            if idade <= ttl:
+                contar('cache_acertos_total')
+                return dados
+            if idade <= ttl + JANELA_OBSOLETA:
+                contar('cache_obsoletos_total')
+                _agendar_revalidacao(ticker, coletor, caminho)
+                return dados
+
+    contar('cache_falhas_total')
+    dados = coletor(ticker)
+    salvar_cache(ticker, dados, caminho)
+    return dados
@@ -0,0 +1,87 @@
+import hashlib
+import os
+
+import pandas as pd
+import streamlit as st
+
+from analise import classificar_acoes, classificar_fiis
+from armazenamento import caminho_preferido, ler_tabela, mtimes
+from ingestao import ErroCabecalho, ler_csv
+
+# 🧊 Copy-on-write: a visão rasa de cada sessão divide os dados com o original até alguém alterar
+# (já é o padrão no pandas 3; no 2.x precisa ser ligado)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# 🔥 Enriquecimento — adiciona a Recomendação quando o arquivo não traz
+def enriquecer(df, tipo):
+    if 'Recomendação' not in df.columns:
+        if tipo == 'acoes':
+            df['Recomendação'] = classificar_acoes(df, coluna_dy='Dividend Yield (%)')
+        else:
+            df['Recomendação'] = classificar_fiis(df)
+    return df
+
+# 🏷️ df.attrs['versao'] identifica o conteúdo carregado (usado nos caches de índices)
+
+# 🤝 Um único DataFrame enriquecido por processo (cache_resource, sem cópia por sessão);
+# cada sessão recebe uma visão rasa — filtros são posições (tabelas.py), nada é clonado
+def _visao(compartilhado):
+    return compartilhado.copy(deep=False)
+
+# 🗂️ Cache por caminho + mtimes do .csv e do .parquet: só relê quando um dos dois muda no disco
+# (prefere o .parquet gerado por armazenamento.py enquanto ele não for mais velho que o CSV)
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _ler_arquivo(caminho, versoes, tipo):
+    df = enriquecer(ler_tabela(caminho, tipo), tipo)
+    df.attrs['versao'] = f'{tipo}:{caminho}:{versoes}'
+    return df
+
+def carregar_arquivo(caminho, tipo):
+    preferido = os.path.abspath(caminho_preferido(caminho))
+    return _visao(_ler_arquivo(preferido, mtimes(caminho), tipo))
+
+# 📥 Cache por hash do conteúdo enviado: o mesmo upload não é reprocessado
+# (a barra de progresso fica fora do cache: o cache guarda só o recipiente do resultado)
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _upload_em_cache(hash_conteudo, tipo):
+    return {}
+
+def _hash(arquivo, tamanho_bloco=1024 * 1024):
+    # SHA-256 em blocos, sem montar uma segunda cópia do upload
+    arquivo.seek(0)
+    hash_conteudo = hashlib.sha256()
+    for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+        hash_conteudo.update(bloco)
+    arquivo.seek(0)
+    return hash_conteudo.hexdigest()
+
+def carregar_upload(arquivo, tipo):
+    hash_conteudo = _hash(arquivo)
+    resultado = _upload_em_cache(hash_conteudo, tipo)
+    if not resultado:
+        progresso = st.progress(0.0, text=f"Lendo {arquivo.name}...")
+
+        def ao_progresso(fracao, linhas):
+            progresso.progress(fracao, text=f"Lendo {arquivo.name}... {linhas:,} linhas")
+
+        try:
+            # Leitura em blocos com schema e quarentena (ingestao.py)
+            df, quarentena, resumo = ler_csv(arquivo, tipo, ao_progresso=ao_progresso)
+        except ErroCabecalho as e:
+            st.error(f"❌ Arquivo rejeitado: {e}")
+            st.stop()
+        finally:
+            progresso.empty()
+        df = enriquecer(df, tipo)
+        df.attrs['versao'] = f'{tipo}:upload:{hash_conteudo}'
+        resultado.update(df=df, quarentena=quarentena, resumo=resumo)
+    df, quarentena, resumo = resultado['df'], resultado['quarentena'], resultado['resumo']
+
+    if resumo['quarentena']:
+        st.warning(f"⚠️ {resumo['quarentena']} de {resumo['linhas']} linhas ignoradas por dados inválidos.")
+        with st.expander("🔍 Linhas em quarentena"):
+            st.dataframe(quarentena, use_container_width=True, hide_index=True)
+            st.download_button("📥 Baixar quarentena CSV", quarentena.to_csv(index=False).encode('utf-8'),
+                               file_name=f'quarentena_{tipo}.csv', mime='text/csv', key=f'quarentena_{tipo}')
+    return _visao(df)
@@ -0,0 +1,232 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from analise import RECOMENDACOES, classificar_acoes, classificar_fiis
+from armazenamento import ler_tabela
+from publicacao import caminho_atual
+
+# 💼 Carteiras: posições (Carteira, Ticker, Quantidade, Preço Médio) cruzadas com os datasets de ações e FIIs.
+# Tudo em arrays: cada posição vira um índice no mercado e cada carteira um código para np.bincount,
+# então milhares de carteiras são reavaliadas numa única passada.
+
+CAMINHO_CARTEIRA = './dados/carteira.csv'
+CAMINHO_EXEMPLO = './dados/carteira_exemplo.csv'
+CARTEIRA_PADRAO = 'principal'
+
+COMPRAR, MANTER, VENDER = range(len(RECOMENDACOES))
+
+def ler_carteira(caminho=CAMINHO_CARTEIRA):
+    df = pd.read_parquet(caminho) if caminho.endswith('.parquet') else pd.read_csv(caminho)
+    faltando = {'Ticker', 'Quantidade', 'Preço Médio'} - set(df.columns)
+    if faltando:
+        raise ValueError(f"Colunas ausentes em {caminho}: {', '.join(sorted(faltando))}")
+    if 'Carteira' not in df.columns:
+        df.insert(0, 'Carteira', CARTEIRA_PADRAO)
+    df['Ticker'] = df['Ticker'].astype(str).str.strip().str.upper().str.removesuffix('.SA')
+    df['Quantidade'] = pd.to_numeric(df['Quantidade'], errors='coerce').fillna(0.0)
+    df['Preço Médio'] = pd.to_numeric(df['Preço Médio'], errors='coerce')
+    return df
+
+def _ler(tipo, pasta):
+    df = ler_tabela(caminho_atual(tipo, pasta), tipo)
+    if 'Recomendação' not in df.columns:
+        if tipo == 'acoes':
+            df['Recomendação'] = classificar_acoes(df, coluna_dy='Dividend Yield (%)')
+        else:
+            df['Recomendação'] = classificar_fiis(df)
+    return df
+
+def _coluna(df, coluna):
+    if coluna not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[coluna].to_numpy(dtype='float64', na_value=np.nan)
+
+def montar_mercado(acoes, fiis):
+    # Uma linha por Ticker com preço, DY, renda mensal por cota (FIIs) e o código da Recomendação
+    preco_fii = _coluna(fiis, 'Preço Atual')
+    renda_fii = _coluna(fiis, 'Renda Mensal (R$)')
+    dy_fii = _coluna(fiis, 'Dividend Yield (%)')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Sem cotação no arquivo de FIIs (vazia ou 0.0): preço implícito = renda anual / DY
+        preco_fii = np.where(preco_fii > 0, preco_fii, renda_fii * 12 / (dy_fii / 100))
+    partes = [
+        pd.DataFrame({
+            'Ticker': acoes['Ticker'].astype(str).to_numpy(),
+            'Tipo': 'Ação',
+            'Preço Atual': _coluna(acoes, 'Preço Atual'),
+            'Dividend Yield (%)': _coluna(acoes, 'Dividend Yield (%)'),
+            'Renda Mensal (R$)': 0.0,
+            'Sinal': pd.Categorical(acoes['Recomendação'], categories=RECOMENDACOES).codes,
+        }),
+        pd.DataFrame({
+            'Ticker': fiis['Ticker'].astype(str).to_numpy(),
+            'Tipo': 'FII',
+            'Preço Atual': preco_fii,
+            'Dividend Yield (%)': dy_fii,
+            'Renda Mensal (R$)': np.nan_to_num(renda_fii),
+            'Sinal': pd.Categorical(fiis['Recomendação'], categories=RECOMENDACOES).codes,
+        }),
+    ]
+    mercado = pd.concat(partes, ignore_index=True)
+    mercado['Ticker'] = mercado['Ticker'].str.upper().str.removesuffix('.SA')
+    return mercado.drop_duplicates('Ticker').set_index('Ticker')
+
+def carregar_mercado(pasta='./dados'):
+    return montar_mercado(_ler('acoes', pasta), _ler('fiis', pasta))
+
+def _arrays(posicoes, mercado):
+    # Índice de cada posição no mercado (-1 = sem cotação) e código de cada carteira
+    indice = mercado.index.get_indexer(posicoes['Ticker'])
+    achou = indice >= 0
+
+    def do_mercado(coluna, vazio=np.nan):
+        valores = mercado[coluna].to_numpy()
+        return np.where(achou, valores[np.where(achou, indice, 0)], vazio)
+
+    codigos, carteiras = pd.factorize(posicoes['Carteira'], sort=True)
+    return {
+        'achou': achou,
+        'preco': do_mercado('Preço Atual').astype('float64'),
+        'dy': do_mercado('Dividend Yield (%)').astype('float64'),
+        'renda': do_mercado('Renda Mensal (R$)', 0.0).astype('float64'),
+        'sinal': do_mercado('Sinal', -1).astype('int64'),
+        'tipo': do_mercado('Tipo', ''),
+        'quantidade': posicoes['Quantidade'].to_numpy(dtype='float64'),
+        'medio': posicoes['Preço Médio'].to_numpy(dtype='float64', na_value=np.nan),
+        'codigos': codigos,
+        'carteiras': carteiras,
+    }
+
+def _por_carteira(codigos, valores, n):
+    return np.bincount(codigos, weights=np.nan_to_num(valores), minlength=n)
+
+def avaliar_carteiras(posicoes, mercado):
+    # Devolve (posições com valor, resultado e peso; resumo por carteira)
+    a = _arrays(posicoes, mercado)
+    n = len(a['carteiras'])
+    cotado = a['achou'] & (a['preco'] > 0)
+    preco = np.where(cotado, a['preco'], np.nan)
+    valor = a['quantidade'] * preco
+    custo = a['quantidade'] * a['medio']
+    renda_anual = valor * a['dy'] / 100
+    renda_mensal_fii = np.where(a['tipo'] == 'FII', a['quantidade'] * a['renda'], 0.0)
+
+    valor_total = _por_carteira(a['codigos'], valor, n)
+    custo_total = _por_carteira(a['codigos'], custo, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peso = valor / valor_total[a['codigos']] * 100
+        resultado_pct = (valor / custo - 1) * 100
+        dy_carteira = _por_carteira(a['codigos'], renda_anual, n) / valor_total * 100
+        resultado_total_pct = (valor_total / custo_total - 1) * 100
+
+    detalhes = posicoes.assign(**{
+        'Tipo': a['tipo'],
+        'Preço Atual': preco,
+        'Valor (R$)': valor.round(2),
+        'Resultado (R$)': (valor - custo).round(2),
+        'Resultado (%)': resultado_pct.round(2),
+        'Peso (%)': peso.round(2),
+        'Renda Mensal FII (R$)': renda_mensal_fii.round(2),
+        'Recomendação': pd.Categorical.from_codes(a['sinal'], categories=RECOMENDACOES),
+    })
+    resumo = pd.DataFrame({
+        'Carteira': a['carteiras'],
+        'Posições': np.bincount(a['codigos'], minlength=n),
+        'Sem Cotação': np.bincount(a['codigos'], weights=~cotado, minlength=n).astype(int),
+        'Valor (R$)': valor_total.round(2),
+        'Custo (R$)': custo_total.round(2),
+        'Resultado (R$)': (valor_total - custo_total).round(2),
+        'Resultado (%)': resultado_total_pct.round(2),
+        'DY da Carteira (%)': dy_carteira.round(2),
+        'Renda Mensal FIIs (R$)': _por_carteira(a['codigos'], renda_mensal_fii, n).round(2),
+    })
+    return detalhes, resumo
+
+def rebalancear(posicoes, mercado, aporte=0.0, alvos=None):
+    # Propõe ordens em direção ao peso alvo sem contrariar os sinais:
+    # 'Vender' nunca recebe compra e 'Comprar' nunca é vendido; o caixa de cada carteira fecha em 'aporte'.
+    # Alvo: coluna 'Peso Alvo (%)' ou dict {Ticker: %}; sem alvo, peso igual entre os que não são 'Vender'.
+    posicoes = posicoes.copy()
+    if alvos is not None:
+        posicoes['Peso Alvo (%)'] = posicoes['Ticker'].map(alvos).fillna(0.0)
+    a = _arrays(posicoes, mercado)
+    n = len(a['carteiras'])
+    cotado = a['achou'] & (a['preco'] > 0)
+    preco = np.where(cotado, a['preco'], 0.0)
+    valor = a['quantidade'] * preco
+
+    if 'Peso Alvo (%)' in posicoes.columns:
+        alvo = posicoes['Peso Alvo (%)'].to_numpy(dtype='float64', na_value=0.0)
+    else:
+        alvo = ((a['sinal'] != VENDER) & cotado).astype('float64')
+    alvo = np.where(cotado, alvo, 0.0)
+    soma_alvo = _por_carteira(a['codigos'], alvo, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alvo = np.nan_to_num(alvo / soma_alvo[a['codigos']])
+
+    patrimonio = _por_carteira(a['codigos'], valor, n) + aporte
+    desejado = alvo * patrimonio[a['codigos']] - valor
+    desejado = np.where(a['sinal'] == VENDER, np.minimum(desejado, 0.0), desejado)
+    desejado = np.where(a['sinal'] == COMPRAR, np.maximum(desejado, 0.0), desejado)
+    desejado = np.where(cotado, desejado, 0.0)
+
+    # Fecha o caixa: compras ≤ vendas + aporte; se sobrar venda, ela é reduzida na mesma proporção
+    compras = _por_carteira(a['codigos'], np.maximum(desejado, 0.0), n)
+    vendas = _por_carteira(a['codigos'], -np.minimum(desejado, 0.0), n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        escala_compra = np.clip(np.nan_to_num((vendas + aporte) / compras, nan=1.0, posinf=1.0), 0.0, 1.0)
+        escala_venda = np.clip(np.nan_to_num((compras - aporte) / vendas, nan=1.0, posinf=1.0), 0.0, 1.0)
+    desejado = np.where(desejado > 0, desejado * escala_compra[a['codigos']], desejado * escala_venda[a['codigos']])
+
+    # Quantidades inteiras (mercado fracionário: lote de 1): compra arredonda para baixo e venda para cima
+    # (limitada ao que se tem), então o caixa nunca fica negativo
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cotas = np.nan_to_num(desejado / preco)
+    quantidade = np.floor(cotas + 1e-9)
+    quantidade = np.maximum(quantidade, -a['quantidade'])
+    ordens = posicoes[['Carteira', 'Ticker']].assign(**{
+        'Recomendação': pd.Categorical.from_codes(a['sinal'], categories=RECOMENDACOES),
+        'Peso Atual (%)': np.round(np.nan_to_num(valor / (patrimonio - aporte)[a['codigos']]) * 100, 2),
+        'Peso Alvo (%)': np.round(alvo * 100, 2),
+        'Ordem': np.select([quantidade > 0, quantidade < 0], ['Comprar', 'Vender'], default='—'),
+        'Quantidade': np.abs(quantidade).astype(int),
+        'Valor (R$)': np.round(np.abs(quantidade) * preco, 2),
+    })
+    return ordens[ordens['Quantidade'] > 0].reset_index(drop=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Carteira BG Analista — valor, resultado, renda e rebalanceamento")
+    parser.add_argument('--carteira', help=f"CSV/Parquet com Carteira, Ticker, Quantidade, Preço Médio (padrão: {CAMINHO_CARTEIRA})")
+    parser.add_argument('--pasta', default='./dados', help="pasta dos datasets (usa a versão publicada, se houver)")
+    parser.add_argument('--rebalancear', action='store_true', help="propõe ordens em direção ao peso alvo")
+    parser.add_argument('--aporte', type=float, default=0.0, help="dinheiro novo por carteira no rebalanceamento")
+    parser.add_argument('--saida', help="pasta para salvar posicoes/resumo/ordens em CSV")
+    args = parser.parse_args()
+
+    caminho = args.carteira or CAMINHO_CARTEIRA
+    if not os.path.exists(caminho):
+        if args.carteira:
+            raise SystemExit(f"❌ Carteira não encontrada: {caminho}")
+        print(f"⚠️ {CAMINHO_CARTEIRA} não existe — usando o exemplo {CAMINHO_EXEMPLO} (informe a sua com --carteira).")
+        caminho = CAMINHO_EXEMPLO
+    posicoes = ler_carteira(caminho)
+    mercado = carregar_mercado(args.pasta)
+    detalhes, resumo = avaliar_carteiras(posicoes, mercado)
+    saidas = {'posicoes': detalhes, 'resumo': resumo}
+
+    print("\n===== CARTEIRAS =====")
+    print(resumo.to_string(index=False))
+    if args.rebalancear:
+        ordens = rebalancear(posicoes, mercado, args.aporte)
+        saidas['ordens'] = ordens
+        print("\n===== ORDENS PROPOSTAS =====")
+        print(ordens.to_string(index=False) if not ordens.empty else "Nenhuma ordem necessária.")
+
+    if args.saida:
+        os.makedirs(args.saida, exist_ok=True)
+        for nome, df in saidas.items():
+            df.to_csv(os.path.join(args.saida, f'{nome}.csv'), index=False)
+        print(f"\n✅ Salvo em {args.saida}")
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from analise import RECOMENDACOES, PARAMETROS_ACOES, PARAMETROS_FIIS, classificar_acoes, classificar_fiis
+from armazenamento import aplicar_schema
+
+# 🧮 Lote de cenários: N arquivos × M conjuntos de parâmetros, em paralelo por processo.
+# Cenários (JSON): [{"nome": "DY 8", "acoes": {"dy_min_compra": 8}, "fiis": {"dy_min_compra": 10}}, ...]
+
+def tipo_do_arquivo(df):
+    return 'fiis' if 'P/VP' in df.columns else 'acoes'
+
+@lru_cache(maxsize=8)
+def _carregar(caminho):
+    # Cada processo lê um arquivo uma vez e reaproveita nos cenários seguintes
+    df = pd.read_parquet(caminho) if caminho.endswith('.parquet') else pd.read_csv(caminho)
+    tipo = tipo_do_arquivo(df)
+    return aplicar_schema(df, tipo), tipo
+
+def _rodar_cenario(caminho, cenario):
+    # Devolve só os códigos da recomendação (int8): o processo pai monta a tabela final
+    df, tipo = _carregar(caminho)
+    if tipo == 'acoes':
+        coluna_dy = 'Dividend Yield (%)' if 'Dividend Yield (%)' in df.columns else 'DY (%)'
+        recomendacao = classificar_acoes(df, coluna_dy=coluna_dy, parametros=cenario.get('acoes'))
+    else:
+        recomendacao = classificar_fiis(df, parametros=cenario.get('fiis'))
+    return tipo, recomendacao.cat.codes.to_numpy(dtype='int8')
+
+def _ler_tickers(caminho):
+    if caminho.endswith('.parquet'):
+        return pd.read_parquet(caminho, columns=['Ticker'])['Ticker'].astype(str)
+    return pd.read_csv(caminho, usecols=['Ticker'], dtype=str)['Ticker']
+
+def _nomes_dos_cenarios(cenarios):
+    # O nome identifica o cenário no resultado: repetido, duas linhas do JSON virariam uma só categoria
+    nomes = [c.get('nome', f'cenario_{i + 1}') for i, c in enumerate(cenarios)]
+    repetidos = sorted({n for n in nomes if nomes.count(n) > 1})
+    if repetidos:
+        raise ValueError(f"Nomes de cenário repetidos: {', '.join(repetidos)}")
+    return nomes
+
+def _rotulos_dos_arquivos(arquivos):
+    # Caminho relativo à pasta comum: dois acoes.csv em pastas diferentes continuam distintos
+    raiz = os.path.commonpath([os.path.dirname(a) for a in arquivos])
+    return [os.path.relpath(a, raiz) for a in arquivos]
+
+def ler_cenarios(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        cenarios = json.load(arquivo)
+    for i, cenario in enumerate(cenarios):
+        cenario.setdefault('nome', f'cenario_{i + 1}')
+        desconhecidos = set(cenario.get('acoes', {})) - set(PARAMETROS_ACOES) | set(cenario.get('fiis', {})) - set(PARAMETROS_FIIS)
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos no cenário '{cenario['nome']}': {sorted(desconhecidos)}")
+    _nomes_dos_cenarios(cenarios)
+    return cenarios
+
+def rodar_cenarios(arquivos, cenarios, workers=None):
+    # Rótulos validados antes do pool: um nome repetido não pode descartar o trabalho já feito
+    arquivos = list(dict.fromkeys(os.path.abspath(a) for a in arquivos))
+    nomes = _nomes_dos_cenarios(cenarios)
+    rotulos = _rotulos_dos_arquivos(arquivos) if arquivos else []
+    # Tarefas em ordem de arquivo: cada bloco enviado a um processo reaproveita o arquivo carregado
+    caminhos = [a for a in arquivos for _ in cenarios]
+    lista_cenarios = [c for _ in arquivos for c in cenarios]
+    workers = workers or os.cpu_count() or 1
+    bloco = max(1, len(caminhos) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partes = list(executor.map(_rodar_cenario, caminhos, lista_cenarios, chunksize=bloco))
+
+    # 🧩 Tabela consolidada montada direto em códigos categóricos (sem copiar strings por linha)
+    tickers_por_arquivo = [_ler_tickers(a) for a in arquivos]
+    categorias_ticker = pd.Index(pd.concat(tickers_por_arquivo, ignore_index=True).unique())
+    codigos_ticker = [categorias_ticker.get_indexer(t).astype('int32') for t in tickers_por_arquivo]
+
+    arquivo, cenario, tipo, ticker, recomendacao = [], [], [], [], []
+    tipos = ['acoes', 'fiis']
+    for k, (tipo_arquivo, codigos) in enumerate(partes):
+        i, j = divmod(k, len(cenarios))
+        n = len(codigos)
+        arquivo.append(np.full(n, i, dtype='int32'))
+        cenario.append(np.full(n, j, dtype='int32'))
+        tipo.append(np.full(n, tipos.index(tipo_arquivo), dtype='int8'))
+        ticker.append(codigos_ticker[i])
+        recomendacao.append(codigos)
+
+    def categorica(partes_codigos, categorias):
+        codigos = np.concatenate(partes_codigos) if partes_codigos else np.empty(0, dtype='int8')
+        return pd.Categorical.from_codes(codigos, categories=categorias)
+
+    return pd.DataFrame({
+        'Arquivo': categorica(arquivo, rotulos),
+        'Cenário': categorica(cenario, nomes),
+        'Tipo': categorica(tipo, tipos),
+        'Ticker': categorica(ticker, categorias_ticker),
+        'Recomendação': categorica(recomendacao, RECOMENDACOES),
+    })
+
+def resumir(resultado):
+    # Contagem de Comprar/Manter/Vender por arquivo × cenário
+    return (resultado.groupby(['Arquivo', 'Cenário', 'Recomendação'], observed=True)
+            .size().unstack(fill_value=0)
+            .reindex(columns=RECOMENDACOES, fill_value=0).reset_index())
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Roda as regras de recomendação para vários arquivos e cenários")
+    parser.add_argument('arquivos', nargs='+', help="CSVs/Parquets no formato de dados/acoes ou dados/fiis")
+    parser.add_argument('--cenarios', required=True, help="JSON com a lista de cenários de parâmetros")
+    parser.add_argument('--saida', default='./relatorios/cenarios.parquet', help=".parquet ou .csv")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--resumo', action='store_true', help="grava só a contagem por arquivo × cenário")
+    args = parser.parse_args()
+
+    resultado = rodar_cenarios(args.arquivos, ler_cenarios(args.cenarios), args.workers)
+    if args.resumo:
+        resultado = resumir(resultado)
+
+    os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+    if args.saida.endswith('.parquet'):
+        resultado.to_parquet(args.saida, index=False)
+    else:
+        resultado.to_csv(args.saida, index=False)
+    print(f"✅ {len(resultado)} linhas salvas em {args.saida}")
@@ -1,11 +1,28 @@
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from metricas import contar, cronometrar
+from provedores import provedor_padrao
+from valuation import valor_justo
 
-def obter_dados(ticker):
-    acao = yf.Ticker(ticker)
-    info = acao.info
+# 📋 Campos que a análise usa — só eles são pedidos ao provedor
+CAMPOS_ACOES = (
+    'currentPrice', 'trailingPE', 'dividendYield', 'returnOnEquity', 'profitMargins',
+    'trailingEps', 'bookValue', 'dividendRate', 'freeCashflow', 'sharesOutstanding',
+)
+CAMPOS_FIIS = ('currentPrice', 'priceToBook', 'dividendYield', 'dividendRate', 'industry', 'sector')
 
-    preco = info.get('currentPrice', 0)
-    pl = info.get('trailingPE', 0)
+# ⚡ Só o preço, pelo caminho leve do provedor
+def obter_cotacao(ticker, provedor=None):
+    provedor = provedor or provedor_padrao()
+    with cronometrar('coleta_obter_cotacao'):
+        return provedor.cotacao(ticker)
+
+def obter_dados(ticker, provedor=None):
+    provedor = provedor or provedor_padrao()
+    with cronometrar('coleta_obter_dados'):
+        info = provedor.fundamentos(ticker, CAMPOS_ACOES)
+
+    preco = info.get('currentPrice', 0) or 0
+    pl = info.get('trailingPE', 0) or 0
     dy = info.get('dividendYield', 0) or 0
     dy = dy * 100 if dy else 0
     roe = info.get('returnOnEquity', 0) or 0
@@ -14,8 +31,16 @@ def obter_dados(ticker):
     margem = info.get('profitMargins', 0) or 0
     margem = margem * 100 if margem else 0
 
-    preco_justo = preco * 1.2
-    upside = ((preco_justo - preco) / preco) * 100 if preco else 0
+    # 💎 Preço justo = mediana de Graham, Gordon e DCF (ver valuation.py)
+    nan = float('nan')
+    lpa = info.get('trailingEps') or nan
+    vpa = info.get('bookValue') or nan
+    dividendo = info.get('dividendRate') or nan
+    acoes = info.get('sharesOutstanding') or 0
+    fcf_acao = info['freeCashflow'] / acoes if info.get('freeCashflow') and acoes else nan
+    fluxo = fcf_acao if fcf_acao > 0 else lpa
+    preco_justo = float(valor_justo(lpa, vpa, dividendo, fluxo)[0])
+    upside = ((preco_justo - preco) / preco) * 100 if preco else nan
 
     return {
         'Ticker': ticker,
@@ -27,4 +52,75 @@ def obter_dados(ticker):
         'ROE (%)': round(roe, 2),
         'ROIC (%)': round(roic, 2),
         'Margem Líquida (%)': round(margem, 2),
+        'LPA': round(lpa, 2),
+        'VPA': round(vpa, 2),
+        'Dividendo por Ação': round(dividendo, 2),
+        'FCF por Ação': round(fcf_acao, 2),
+    }
+
+def obter_dados_fii(ticker, provedor=None):
+    provedor = provedor or provedor_padrao()
+    with cronometrar('coleta_obter_dados_fii'):
+        info = provedor.fundamentos(ticker, CAMPOS_FIIS)
+
+    preco = info.get('currentPrice') or float('nan')  # sem cotação não vira preço zero
+    pvp = info.get('priceToBook', 0) or 0
+    dy = info.get('dividendYield', 0) or 0
+    dy = dy * 100 if dy else 0
+    renda_anual = info.get('dividendRate', 0) or 0
+
+    return {
+        'Ticker': ticker,
+        'Setor': info.get('industry') or info.get('sector') or 'Não informado',
+        'Preço Atual': round(preco, 2),
+        'P/VP': round(pvp, 2),
+        'Dividend Yield (%)': round(dy, 2),
+        'Vacância (%)': float('nan'),  # o Yahoo não publica vacância; o screener mantém a da base anterior
+        'Renda Mensal (R$)': round(renda_anual / 12, 2),
     }
+
+# 🔥 Coleta em lote — vários tickers em paralelo com pool limitado
+def iterar_dados_em_lote(tickers, max_workers=8, coletor=obter_dados):
+    # Entrega (posição, ticker, dados, erro) na ordem em que cada ticker termina
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {
+            executor.submit(coletor, ticker): (i, ticker)
+            for i, ticker in enumerate(tickers)
+        }
+        for futuro in as_completed(futuros):
+            i, ticker = futuros[futuro]
+            contar('coleta_tickers_total')
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                contar('coleta_erros_total')
+                yield i, ticker, None, e
+            else:
+                yield i, ticker, resultado, None
+
+def iterar_dados_em_ordem(tickers, max_workers=8, coletor=obter_dados):
+    # Mesmo que iterar_dados_em_lote, mas na ordem de entrada: quem chega adiantado espera num buffer
+    # só até os anteriores terminarem (o relatório continua em streaming e sai igual entre execuções)
+    pendentes = {}
+    proximo = 0
+    for i, ticker, dados, erro in iterar_dados_em_lote(tickers, max_workers, coletor):
+        pendentes[i] = (i, ticker, dados, erro)
+        while proximo in pendentes:
+            yield pendentes.pop(proximo)
+            proximo += 1
+
+def obter_dados_em_lote(tickers, max_workers=8, coletor=obter_dados, ao_concluir=None):
+    # Retorna os dados na ordem de entrada + dicionário {ticker: erro}
+    tickers = list(tickers)
+    resultados = [None] * len(tickers)
+    erros = {}
+    concluidos = 0
+    for i, ticker, dados, erro in iterar_dados_em_lote(tickers, max_workers, coletor):
+        concluidos += 1
+        if erro is None:
+            resultados[i] = dados
+        else:
+            erros[ticker] = erro
+        if ao_concluir is not None:
+            ao_concluir(concluidos, len(tickers), ticker, dados, erro)
+    return [r for r in resultados if r is not None], erros
@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from coleta_dados import obter_dados
-from analise import gerar_recomendacao
+from carregamento import carregar_arquivo
+from publicacao import caminho_atual, data_da_versao, versao_atual
+from metricas import cronometrar, resumo
+from agregados import calcular_agregados, contagem, media, pizza, total
+from graficos import mostrar_indicadores
 
 # 🎯 Configuração da página
 st.set_page_config(page_title="BG Analista de Ações e FIIs", layout="wide")
@@ -23,32 +26,45 @@ ativos = st.sidebar.text_input(
 
 ativos = [a.strip().upper() for a in ativos]
 
+# 📦 Os dados vêm da última versão publicada pelo atualizador.py — a página nunca chama a API
+versao = versao_atual('./dados')
+if versao is not None:
+    st.sidebar.caption(f"📦 Dados publicados em {data_da_versao(versao):%d/%m/%Y %H:%M}")
+else:
+    st.sidebar.caption("📦 Nenhuma versão publicada — usando ./dados/acoes.csv e ./dados/fiis.csv")
+
 st.sidebar.markdown("---")
 rodar = st.sidebar.button("🔍 Rodar Análise")
 
 if rodar:
     st.subheader("🔍 Resultado da Análise")
 
-    dados = []
-    for ticker in ativos:
-        try:
-            dados.append(obter_dados(ticker))
-        except Exception as e:
-            st.error(f"Erro ao obter dados de {ticker}: {e}")
-
-    if dados:
-        df = pd.DataFrame(dados)
-        df['Recomendação'] = df.apply(gerar_recomendacao, axis=1)
-
+    # 📄 Seleciona os tickers pedidos nas tabelas publicadas (ações e FIIs)
+    with cronometrar('dashboard_selecionar_ativos'):
+        simbolos = [a.removesuffix('.SA') for a in ativos if a]
+        partes, versoes = [], []
+        for tipo in ('acoes', 'fiis'):
+            tabela = carregar_arquivo(caminho_atual(tipo, './dados'), tipo)
+            versoes.append(tabela.attrs['versao'])
+            partes.append(tabela[tabela['Ticker'].astype(str).isin(simbolos)].astype({'Ticker': str, 'Recomendação': str}))
+        df = pd.concat(partes, ignore_index=True).rename(columns={'Dividend Yield (%)': 'DY (%)'})
+        df.attrs['versao'] = f"ativos:{'|'.join(versoes)}:{','.join(sorted(simbolos))}"
+
+    faltando = sorted(set(simbolos) - set(df['Ticker']))
+    if faltando:
+        st.warning(f"⚠️ Fora do universo publicado (adicione em dados/ativos_b3.csv): {', '.join(faltando)}")
+
+    if not df.empty:
         # 🎯 Cards de resumo
         col1, col2, col3, col4 = st.columns(4)
 
-        total_ativos = df.shape[0]
-        total_comprar = df[df['Recomendação'] == 'Comprar'].shape[0]
-        total_manter = df[df['Recomendação'] == 'Manter'].shape[0]
-        total_vender = df[df['Recomendação'] == 'Vender'].shape[0]
-        media_dy = round(df['DY (%)'].mean(), 2)
-        media_upside = round(df['Upside (%)'].mean(), 2)
+        agregados = calcular_agregados(df, ['DY (%)', 'Upside (%)'])
+        total_ativos = total(agregados)
+        total_comprar = contagem(agregados, 'Comprar')
+        total_manter = contagem(agregados, 'Manter')
+        total_vender = contagem(agregados, 'Vender')
+        media_dy = media(agregados, 'DY (%)')
+        media_upside = media(agregados, 'Upside (%)')
 
         col1.metric("🔢 Total de Ativos", total_ativos)
         col2.metric("🟢 Comprar", total_comprar)
@@ -64,8 +80,7 @@ if rodar:
         st.markdown("---")
 
         # 📊 Gráfico de Pizza — Recomendações
-        recomendacoes = df['Recomendação'].value_counts().reset_index()
-        recomendacoes.columns = ['Recomendacao', 'Count']
+        recomendacoes = pizza(agregados)
 
         fig_pizza = px.pie(
             recomendacoes,
@@ -77,27 +92,8 @@ if rodar:
 
         st.plotly_chart(fig_pizza, use_container_width=True)
 
-        # 📈 Gráfico de Barras — Dividend Yield por Ativo
-        fig_bar = px.bar(
-            df,
-            x='Ticker',
-            y='DY (%)',
-            title='Dividend Yield (%) por Ativo',
-            text_auto=True,
-            color='Recomendação'
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-        # 📈 Gráfico de Barras — Upside por Ativo
-        fig_upside = px.bar(
-            df,
-            x='Ticker',
-            y='Upside (%)',
-            title='Upside (%) por Ativo',
-            text_auto=True,
-            color='Recomendação'
-        )
-        st.plotly_chart(fig_upside, use_container_width=True)
+        # 📈 DY e Upside por ativo num único gráfico (Top N / distribuição / WebGL acima do limite)
+        mostrar_indicadores(df, ('DY (%)', 'Upside (%)'), 'Indicadores por Ativo', 'ativos', texto=True)
 
         st.markdown("---")
 
@@ -114,10 +110,14 @@ if rodar:
             mime='text/csv',
         )
     else:
-        st.warning("Nenhum dado coletado. Verifique os tickers e tente novamente.")
+        st.warning("Nenhum dos tickers está na versão publicada. Verifique os tickers e tente novamente.")
 
 else:
     st.info("Configure os ativos na barra lateral e clique em 'Rodar Análise'.")
 
+# ⏱️ Métricas do processo (leitura, análise)
+with st.sidebar.expander("⏱️ Métricas"):
+    st.json(resumo())
+
 st.markdown("---")
 st.caption("BG Analista — Desenvolvido por Helder • Baseado nos métodos de Buffett e Graham")
@@ -1,7 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import os
+from metricas import registrar_primeira_tela
+
+# 📂 Pasta dos dados (o run_app aponta para o snapshot empacotado)
+PASTA_DADOS = os.environ.get('BG_DADOS', 'BG_Investimentos/dados')
+PASTA_EXECUCOES = os.environ.get('BG_EXECUCOES', 'BG_Investimentos/relatorios/execucoes')
 
 # ==============================================
 # 🔒 SISTEMA DE LOGIN + LOGOUT
@@ -42,8 +45,18 @@ def logout():
 # 🔐 Controle de login
 if not st.session_state['logado']:
     autenticar_usuario()
+    registrar_primeira_tela()
     st.stop()
 
+# ⚡ Imports pesados só depois do login: a tela inicial abre sem carregar pandas/plotly
+import plotly.express as px
+from carregamento import carregar_arquivo, carregar_upload
+from tabelas import mostrar_tabela
+from graficos import mostrar_indicadores
+from agregados import agregados_do_dataset, media, pizza, total
+from publicacao import caminho_atual
+from execucoes import data_da_execucao, diferenca, linha_do_tempo, listar_execucoes
+
 # ==============================================
 # 🎯 CONFIGURAÇÃO DO DASHBOARD
 # ==============================================
@@ -60,52 +73,28 @@ if st.sidebar.button("🚪 Logout"):
 
 menu = st.sidebar.selectbox(
     "Selecione a Análise:",
-    ("🏠 Dashboard Geral", "📈 Ações", "🏢 FIIs")
+    ("🏠 Dashboard Geral", "📈 Ações", "🏢 FIIs", "🔄 O que mudou")
 )
 
 st.sidebar.subheader("📥 Upload dos Dados")
 
-# 🔥 Função para carregar dados com fallback
-def carregar_dados(caminho, texto_upload):
+# 🔥 Função para carregar dados com fallback (última versão publicada, já com Recomendação, em cache entre reruns)
+def carregar_dados(caminho, texto_upload, tipo):
     if os.path.exists(caminho):
-        return pd.read_csv(caminho)
+        return carregar_arquivo(caminho, tipo)
     else:
         arquivo = st.sidebar.file_uploader(texto_upload, type=["csv"])
         if arquivo is not None:
-            return pd.read_csv(arquivo)
+            return carregar_upload(arquivo, tipo)
         else:
             st.warning(f"⚠️ Envie o arquivo {texto_upload} na barra lateral.")
             st.stop()
 
 # 📄 Carregar Ações
-df_acoes = carregar_dados('BG_Investimentos/dados/acoes.csv', "Upload CSV de Ações")
+df_acoes = carregar_dados(caminho_atual('acoes', PASTA_DADOS), "Upload CSV de Ações", 'acoes')
 
 # 📄 Carregar FIIs
-df_fiis = carregar_dados('BG_Investimentos/dados/fiis.csv', "Upload CSV de FIIs")
-
-# 🔥 Função de recomendação para Ações
-def gerar_recomendacao_acao(row):
-    if row['Upside (%)'] > 10 and row['Dividend Yield (%)'] >= 6 and row['ROE (%)'] >= 15:
-        return 'Comprar'
-    elif row['Upside (%)'] < -5:
-        return 'Vender'
-    else:
-        return 'Manter'
-
-if 'Recomendação' not in df_acoes.columns:
-    df_acoes['Recomendação'] = df_acoes.apply(gerar_recomendacao_acao, axis=1)
-
-# 🔥 Função de recomendação para FIIs
-def gerar_recomendacao_fii(row):
-    if row['P/VP'] < 0.95 and row['Dividend Yield (%)'] > 9 and row['Vacância (%)'] < 5:
-        return 'Comprar'
-    elif row['P/VP'] > 1.10 or row['Vacância (%)'] > 10:
-        return 'Vender'
-    else:
-        return 'Manter'
-
-if 'Recomendação' not in df_fiis.columns:
-    df_fiis['Recomendação'] = df_fiis.apply(gerar_recomendacao_fii, axis=1)
+df_fiis = carregar_dados(caminho_atual('fiis', PASTA_DADOS), "Upload CSV de FIIs", 'fiis')
 
 # =====================
 # 🏠 DASHBOARD GERAL
@@ -113,20 +102,26 @@ if 'Recomendação' not in df_fiis.columns:
 if menu == "🏠 Dashboard Geral":
     st.subheader("📊 Visão Geral dos Ativos")
 
-    total_acoes = df_acoes.shape[0]
-    total_fiis = df_fiis.shape[0]
+    # 📊 Cards e pizzas a partir dos agregados em cache (um agrupamento por dataset)
+    agregados_acoes = agregados_do_dataset(
+        df_acoes.attrs.get('versao', 'acoes'), df_acoes, ('Dividend Yield (%)', 'Upside (%)'))
+    agregados_fiis = agregados_do_dataset(
+        df_fiis.attrs.get('versao', 'fiis'), df_fiis, ('Dividend Yield (%)', 'P/VP'))
+
+    total_acoes = total(agregados_acoes)
+    total_fiis = total(agregados_fiis)
 
     col1, col2 = st.columns(2)
     col1.metric("💼 Total de Ações", total_acoes)
     col2.metric("🏢 Total de FIIs", total_fiis)
 
     col3, col4 = st.columns(2)
-    col3.metric("📈 DY Médio Ações", f"{round(df_acoes['Dividend Yield (%)'].mean(), 2)}%")
-    col4.metric("🏢 DY Médio FIIs", f"{round(df_fiis['Dividend Yield (%)'].mean(), 2)}%")
+    col3.metric("📈 DY Médio Ações", f"{media(agregados_acoes, 'Dividend Yield (%)')}%")
+    col4.metric("🏢 DY Médio FIIs", f"{media(agregados_fiis, 'Dividend Yield (%)')}%")
 
     col5, col6 = st.columns(2)
-    col5.metric("🚀 Upside Médio Ações", f"{round(df_acoes['Upside (%)'].mean(), 2)}%")
-    col6.metric("📏 P/VP Médio FIIs", round(df_fiis['P/VP'].mean(), 2))
+    col5.metric("🚀 Upside Médio Ações", f"{media(agregados_acoes, 'Upside (%)')}%")
+    col6.metric("📏 P/VP Médio FIIs", media(agregados_fiis, 'P/VP'))
 
     st.markdown("---")
 
@@ -134,8 +129,7 @@ if menu == "🏠 Dashboard Geral":
 
     col7, col8 = st.columns(2)
 
-    recomendacoes_acoes = df_acoes['Recomendação'].value_counts().reset_index()
-    recomendacoes_acoes.columns = ['Recomendacao', 'Count']
+    recomendacoes_acoes = pizza(agregados_acoes)
 
     fig_acoes = px.pie(
         recomendacoes_acoes,
@@ -146,8 +140,7 @@ if menu == "🏠 Dashboard Geral":
     )
     col7.plotly_chart(fig_acoes, use_container_width=True)
 
-    recomendacoes_fiis = df_fiis['Recomendação'].value_counts().reset_index()
-    recomendacoes_fiis.columns = ['Recomendacao', 'Count']
+    recomendacoes_fiis = pizza(agregados_fiis)
 
     fig_fiis = px.pie(
         recomendacoes_fiis,
@@ -164,25 +157,12 @@ if menu == "🏠 Dashboard Geral":
 elif menu == "📈 Ações":
     st.subheader("📈 Análise de Ações")
 
-    st.dataframe(df_acoes, use_container_width=True)
+    mostrar_tabela(df_acoes, 'acoes', {'Recomendação': st.multiselect(
+        "Filtrar por Recomendação:", options=['Comprar', 'Manter', 'Vender'], default=['Comprar', 'Manter', 'Vender']
+    )})
 
-    fig_dy = px.bar(
-        df_acoes,
-        x='Ticker',
-        y='Dividend Yield (%)',
-        title='Dividend Yield (%) por Ação',
-        color='Recomendação'
-    )
-    st.plotly_chart(fig_dy, use_container_width=True)
-
-    fig_upside = px.bar(
-        df_acoes,
-        x='Ticker',
-        y='Upside (%)',
-        title='Upside (%) por Ação',
-        color='Recomendação'
-    )
-    st.plotly_chart(fig_upside, use_container_width=True)
+    # 📊 DY e Upside num único gráfico (Top N / distribuição / WebGL acima do limite)
+    mostrar_indicadores(df_acoes, ('Dividend Yield (%)', 'Upside (%)'), 'Indicadores por Ação', 'acoes')
 
     csv = df_acoes.to_csv(index=False).encode('utf-8')
     st.download_button(
@@ -198,34 +178,12 @@ elif menu == "📈 Ações":
 elif menu == "🏢 FIIs":
     st.subheader("🏢 Análise de FIIs")
 
-    st.dataframe(df_fiis, use_container_width=True)
+    mostrar_tabela(df_fiis, 'fiis', {'Recomendação': st.multiselect(
+        "Filtrar por Recomendação:", options=['Comprar', 'Manter', 'Vender'], default=['Comprar', 'Manter', 'Vender']
+    )})
 
-    fig_dy = px.bar(
-        df_fiis,
-        x='Ticker',
-        y='Dividend Yield (%)',
-        title='Dividend Yield (%) por FII',
-        color='Recomendação'
-    )
-    st.plotly_chart(fig_dy, use_container_width=True)
-
-    fig_pvp = px.bar(
-        df_fiis,
-        x='Ticker',
-        y='P/VP',
-        title='P/VP por FII',
-        color='Recomendação'
-    )
-    st.plotly_chart(fig_pvp, use_container_width=True)
-
-    fig_vacancia = px.bar(
-        df_fiis,
-        x='Ticker',
-        y='Vacância (%)',
-        title='Vacância (%) por FII',
-        color='Recomendação'
-    )
-    st.plotly_chart(fig_vacancia, use_container_width=True)
+    # 📊 DY, P/VP e Vacância num único gráfico (Top N / distribuição / WebGL acima do limite)
+    mostrar_indicadores(df_fiis, ('Dividend Yield (%)', 'P/VP', 'Vacância (%)'), 'Indicadores por FII', 'fiis')
 
     csv = df_fiis.to_csv(index=False).encode('utf-8')
     st.download_button(
@@ -234,3 +192,28 @@ elif menu == "🏢 FIIs":
         file_name='relatorio_bg_fiis.csv',
         mime='text/csv',
     )
+
+# =====================
+# 🔄 O QUE MUDOU (execuções do bg_analista)
+# =====================
+elif menu == "🔄 O que mudou":
+    st.subheader("🔄 O que mudou entre execuções")
+
+    execucoes = listar_execucoes(PASTA_EXECUCOES)
+    if len(execucoes) < 2:
+        st.info("ℹ️ São necessárias ao menos duas execuções do bg_analista para comparar.")
+    else:
+        rotulo = lambda e: data_da_execucao(e).strftime('%d/%m/%Y %H:%M:%S')
+        col1, col2 = st.columns(2)
+        anterior = col1.selectbox("Execução anterior:", execucoes[:-1], index=len(execucoes) - 2, format_func=rotulo)
+        atual = col2.selectbox("Execução atual:", execucoes[::-1], format_func=rotulo)
+
+        mudancas = diferenca(anterior, atual, PASTA_EXECUCOES, somente_mudancas=not st.checkbox("Mostrar ativos sem mudança"))
+        st.metric("🔁 Recomendações alteradas", int((mudancas['Situação'] == 'Mudou').sum()))
+        st.dataframe(mudancas, use_container_width=True, hide_index=True)
+
+        st.markdown("---")
+        st.subheader("🕒 Histórico de mudanças")
+        st.dataframe(linha_do_tempo(execucoes, PASTA_EXECUCOES).iloc[::-1], use_container_width=True, hide_index=True)
+
+registrar_primeira_tela()
@@ -1,6 +1,10 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from carregamento import carregar_arquivo, carregar_upload
+from tabelas import mostrar_tabela
+from graficos import mostrar_indicadores
+from publicacao import caminho_atual
+from agregados import agregados_do_dataset, contagem, media, pizza, total
 
 # 🎯 Configuração da página
 st.set_page_config(page_title="BG Analista de FIIs", layout="wide")
@@ -16,40 +20,31 @@ uploaded_file = st.sidebar.file_uploader(
     type=["csv"]
 )
 
-# 🗂️ Fallback: Se não fizer upload, carrega o CSV da pasta ./dados/
+# 🗂️ Fallback: Se não fizer upload, carrega a última versão publicada (ou o CSV da pasta ./dados/)
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    df = carregar_upload(uploaded_file, 'fiis')
     st.success("✅ Arquivo carregado com sucesso via upload!")
 else:
     try:
-        df = pd.read_csv('./dados/fiis.csv')
-        st.info("ℹ️ Nenhum arquivo foi enviado. Usando o arquivo padrão da pasta './dados/fiis.csv'.")
+        caminho = caminho_atual('fiis', './dados')
+        df = carregar_arquivo(caminho, 'fiis')
+        st.info(f"ℹ️ Nenhum arquivo foi enviado. Usando a última versão publicada: '{caminho}'.")
     except Exception as e:
         st.error(f"❌ Nenhum arquivo foi enviado e não encontramos o arquivo padrão. Erro: {e}")
         st.stop()
 
-# 🎯 Função de Recomendação
-def gerar_recomendacao_fii(row):
-    if row['P/VP'] < 0.95 and row['Dividend Yield (%)'] > 9 and row['Vacância (%)'] < 5:
-        return 'Comprar'
-    elif row['P/VP'] > 1.10 or row['Vacância (%)'] > 10:
-        return 'Vender'
-    else:
-        return 'Manter'
-
-# ✔️ Aplicar recomendação se não existir
-if 'Recomendação' not in df.columns:
-    df['Recomendação'] = df.apply(gerar_recomendacao_fii, axis=1)
-
 # 🎯 Cards de Resumo Gerais
 st.subheader("📊 Resumo Geral dos FIIs")
 
 col1, col2, col3, col4 = st.columns(4)
 
-col1.metric("Total de FIIs", df.shape[0])
-col2.metric("DY Médio (%)", f"{round(df['Dividend Yield (%)'].mean(), 2)}%")
-col3.metric("Vacância Média (%)", f"{round(df['Vacância (%)'].mean(), 2)}%")
-col4.metric("P/VP Médio", round(df['P/VP'].mean(), 2))
+# 📊 Todos os cards e a pizza saem de um único agrupamento, em cache com o dataset
+agregados = agregados_do_dataset(df.attrs.get('versao', 'fiis'), df, ('Dividend Yield (%)', 'Vacância (%)', 'P/VP'))
+
+col1.metric("Total de FIIs", total(agregados))
+col2.metric("DY Médio (%)", f"{media(agregados, 'Dividend Yield (%)')}%")
+col3.metric("Vacância Média (%)", f"{media(agregados, 'Vacância (%)')}%")
+col4.metric("P/VP Médio", media(agregados, 'P/VP'))
 
 st.markdown("---")
 
@@ -58,9 +53,9 @@ st.subheader("🎯 Distribuição das Recomendações")
 
 col5, col6, col7 = st.columns(3)
 
-total_comprar = df[df['Recomendação'] == 'Comprar'].shape[0]
-total_manter = df[df['Recomendação'] == 'Manter'].shape[0]
-total_vender = df[df['Recomendação'] == 'Vender'].shape[0]
+total_comprar = contagem(agregados, 'Comprar')
+total_manter = contagem(agregados, 'Manter')
+total_vender = contagem(agregados, 'Vender')
 
 col5.metric("🟢 Comprar", total_comprar)
 col6.metric("🟡 Manter", total_manter)
@@ -69,8 +64,7 @@ col7.metric("🔴 Vender", total_vender)
 st.markdown("---")
 
 # 📊 Gráfico de Pizza — Distribuição das Recomendações
-recomendacoes = df['Recomendação'].value_counts().reset_index()
-recomendacoes.columns = ['Recomendacao', 'Count']
+recomendacoes = pizza(agregados)
 
 fig_pizza = px.pie(
     recomendacoes,
@@ -90,53 +84,31 @@ st.markdown("---")
 # 🎯 Gráficos padrão
 st.subheader("📊 Análise dos Indicadores")
 
-# 📈 DY
-fig_dy = px.bar(
-    df,
-    x='Ticker',
-    y='Dividend Yield (%)',
-    title='Dividend Yield (%) por FII',
-    text_auto=True,
-    color='Recomendação'
-)
-st.plotly_chart(fig_dy, use_container_width=True)
-
-# 📈 P/VP
-fig_pvp = px.bar(
-    df,
-    x='Ticker',
-    y='P/VP',
-    title='P/VP por FII',
-    text_auto=True,
-    color='Recomendação'
-)
-st.plotly_chart(fig_pvp, use_container_width=True)
-
-# 📈 Vacância
-fig_vacancia = px.bar(
-    df,
-    x='Ticker',
-    y='Vacância (%)',
-    title='Vacância (%) por FII',
-    text_auto=True,
-    color='Recomendação'
-)
-st.plotly_chart(fig_vacancia, use_container_width=True)
+# 📈 DY, P/VP e Vacância num único gráfico (Top N / distribuição / WebGL acima do limite)
+mostrar_indicadores(df, ('Dividend Yield (%)', 'P/VP', 'Vacância (%)'), 'Indicadores por FII', 'fiis', texto=True)
 
 st.markdown("---")
 
 # 🎯 Filtros na Tabela
 st.subheader("🔎 Filtro e Dados Detalhados")
 
+recomendacoes_disponiveis = list(df['Recomendação'].dropna().unique())
+setores_disponiveis = list(df['Setor'].dropna().unique()) if 'Setor' in df.columns else []
+
 filtro_recomendacao = st.multiselect(
     "Filtrar por Recomendação:",
-    options=df['Recomendação'].unique(),
-    default=df['Recomendação'].unique()
+    options=recomendacoes_disponiveis,
+    default=recomendacoes_disponiveis
 )
+filtros = {'Recomendação': filtro_recomendacao}
 
-df_filtrado = df[df['Recomendação'].isin(filtro_recomendacao)]
+if setores_disponiveis:
+    filtro_setor = st.multiselect("Filtrar por Setor:", options=setores_disponiveis, default=setores_disponiveis)
+    filtros['Setor'] = filtro_setor
 
-st.dataframe(df_filtrado, use_container_width=True)
+# 📄 Tabela paginada (filtro, busca e ordenação feitos no servidor)
+posicoes = mostrar_tabela(df, 'fiis', filtros)
+df_filtrado = df.iloc[posicoes]
 
 # 📥 Download do relatório filtrado
 csv = df_filtrado.to_csv(index=False).encode('utf-8')
@@ -0,0 +1,175 @@
+import os
+import stat
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from analise import RECOMENDACOES
+from armazenamento import NUMERO, SCHEMAS, aplicar_schema
+from metricas import cronometrar
+from relatorio import EscritorParquet
+
+# 🗂️ Histórico de execuções: cada rodada vira um snapshot Parquet (zstd) imutável com carimbo de hora.
+# Nada é sobrescrito — comparar duas rodadas é um join por Ticker, sem reabrir planilhas.
+
+PASTA_EXECUCOES = './relatorios/execucoes'
+PREFIXO = 'execucao_'
+FORMATO_ID = '%Y%m%dT%H%M%S%f'
+
+METRICAS_DIFF = ('Preço Atual', 'Preço Justo', 'Upside (%)', 'DY (%)', 'Dividend Yield (%)', 'ROE (%)', 'P/L', 'P/VP')
+
+def _caminho(execucao, pasta):
+    return os.path.join(pasta, f'{PREFIXO}{execucao}.parquet')
+
+def _temporario(execucao, pasta):
+    return os.path.join(pasta, f'.tmp_{PREFIXO}{execucao}.parquet')
+
+def _publicar(temporario, caminho):
+    # Link exclusivo: uma execução existente nunca é trocada
+    try:
+        os.link(temporario, caminho)
+    finally:
+        os.remove(temporario)
+    os.chmod(caminho, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+def salvar_execucao(linhas, pasta=PASTA_EXECUCOES, quando=None):
+    # Grava em .tmp e publica com link exclusivo
+    df = aplicar_schema(pd.DataFrame(linhas), 'acoes')
+    execucao = (quando or datetime.now()).strftime(FORMATO_ID)
+    os.makedirs(pasta, exist_ok=True)
+    temporario = _temporario(execucao, pasta)
+    with cronometrar('execucoes_salvar'):
+        df.to_parquet(temporario, index=False, compression='zstd')
+        _publicar(temporario, _caminho(execucao, pasta))
+    return execucao
+
+@contextmanager
+def abrir_execucao(pasta=PASTA_EXECUCOES, quando=None, tamanho_lote=1000):
+    # Snapshot em streaming: as linhas vão em lotes para o .tmp e só viram execução se o bloco terminar bem.
+    # O id fica em `escritor.execucao` (None se nenhuma linha foi escrita).
+    import pyarrow as pa
+    execucao = (quando or datetime.now()).strftime(FORMATO_ID)
+    os.makedirs(pasta, exist_ok=True)
+    temporario = _temporario(execucao, pasta)
+    tipos = {c: pa.float32() if t == NUMERO else pa.string() for c, t in SCHEMAS['acoes'].items()}
+    escritor = EscritorParquet(temporario, tamanho_lote, tipos)
+    escritor.execucao = None
+    concluido = False
+    try:
+        yield escritor
+        concluido = True
+    finally:
+        escritor.fechar()
+        if concluido and escritor.escritor is not None:
+            with cronometrar('execucoes_salvar'):
+                _publicar(temporario, _caminho(execucao, pasta))
+            escritor.execucao = execucao
+        elif os.path.exists(temporario):
+            os.remove(temporario)
+
+def listar_execucoes(pasta=PASTA_EXECUCOES):
+    if not os.path.isdir(pasta):
+        return []
+    return sorted(
+        nome[len(PREFIXO):-len('.parquet')]
+        for nome in os.listdir(pasta)
+        if nome.startswith(PREFIXO) and nome.endswith('.parquet')
+    )
+
+def data_da_execucao(execucao):
+    return datetime.strptime(execucao, FORMATO_ID)
+
+@lru_cache(maxsize=512)
+def _ler(execucao, pasta, colunas):
+    # Snapshots são imutáveis: a leitura (só das colunas pedidas) pode ficar em cache para sempre
+    return pd.read_parquet(_caminho(execucao, pasta), columns=list(colunas) if colunas else None)
+
+def ler_execucao(execucao, pasta=PASTA_EXECUCOES, colunas=None):
+    return _ler(execucao, pasta, tuple(colunas) if colunas else None).copy()
+
+def _colunas_existentes(execucao, pasta):
+    import pyarrow.parquet as pq
+    return pq.read_schema(_caminho(execucao, pasta)).names
+
+def diferenca(anterior, atual, pasta=PASTA_EXECUCOES, metricas=METRICAS_DIFF, somente_mudancas=False):
+    # Join externo por Ticker: mudança de recomendação, entradas/saídas e deltas das métricas
+    with cronometrar('execucoes_diferenca'):
+        comuns = [m for m in metricas
+                  if m in _colunas_existentes(anterior, pasta) and m in _colunas_existentes(atual, pasta)]
+        colunas = ('Ticker', 'Recomendação', *comuns)
+        antes = _ler(anterior, pasta, colunas).set_index('Ticker')
+        depois = _ler(atual, pasta, colunas).set_index('Ticker')
+        antes.index = antes.index.astype(str)
+        depois.index = depois.index.astype(str)
+
+        juntos = antes.join(depois, how='outer', lsuffix=' (antes)', rsuffix=' (depois)')
+        rec_antes = juntos['Recomendação (antes)']
+        rec_depois = juntos['Recomendação (depois)']
+
+        resultado = pd.DataFrame(index=juntos.index)
+        resultado['Recomendação Anterior'] = rec_antes
+        resultado['Recomendação Atual'] = rec_depois
+        resultado['Situação'] = np.select(
+            [rec_antes.isna(), rec_depois.isna(), rec_antes.astype(str) != rec_depois.astype(str)],
+            ['Novo', 'Removido', 'Mudou'],
+            default='Igual',
+        )
+        for metrica in comuns:
+            resultado[f'Δ {metrica}'] = (
+                juntos[f'{metrica} (depois)'].astype('float64') - juntos[f'{metrica} (antes)'].astype('float64')
+            ).round(2)
+        resultado = resultado.reset_index()
+        if somente_mudancas:
+            resultado = resultado[resultado['Situação'] != 'Igual'].reset_index(drop=True)
+        return resultado
+
+def linha_do_tempo(execucoes=None, pasta=PASTA_EXECUCOES):
+    # Recomendação de cada Ticker em cada execução (só duas colunas por arquivo) e as transições
+    return _linha_do_tempo(tuple(execucoes or listar_execucoes(pasta)), pasta).copy()
+
+@lru_cache(maxsize=16)
+def _linha_do_tempo(execucoes, pasta):
+    if not execucoes:
+        return pd.DataFrame(columns=['Ticker', 'Execução', 'De', 'Para'])
+    with cronometrar('execucoes_linha_do_tempo'):
+        partes = [_ler(e, pasta, ('Ticker', 'Recomendação')) for e in execucoes]
+        # Tudo em categorias/códigos: evita converter centenas de colunas de texto
+        longo = pd.DataFrame({
+            'Ticker': union_categoricals([p['Ticker'].astype('category').array for p in partes]),
+            'Execução': np.repeat(list(execucoes), [len(p) for p in partes]),
+            'Para': pd.Categorical.from_codes(np.concatenate([
+                p['Recomendação'].astype('category').cat.set_categories(RECOMENDACOES).cat.codes.to_numpy()
+                for p in partes
+            ]), categories=RECOMENDACOES),
+        }).sort_values(['Ticker', 'Execução'], kind='stable')
+        longo['De'] = longo.groupby('Ticker', observed=True)['Para'].shift()
+        mudou = longo['De'].notna() & (longo['De'] != longo['Para'])
+        resultado = longo.loc[mudou, ['Ticker', 'Execução', 'De', 'Para']].reset_index(drop=True)
+        resultado['Ticker'] = resultado['Ticker'].astype(str)
+        return resultado
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compara execuções do BG Analista")
+    parser.add_argument('anterior', nargs='?', help="id da execução anterior (padrão: penúltima)")
+    parser.add_argument('atual', nargs='?', help="id da execução atual (padrão: última)")
+    parser.add_argument('--pasta', default=PASTA_EXECUCOES)
+    parser.add_argument('--todos', action='store_true', help="mostra também os ativos sem mudança")
+    parser.add_argument('--listar', action='store_true', help="lista as execuções gravadas")
+    args = parser.parse_args()
+
+    execucoes = listar_execucoes(args.pasta)
+    if args.listar:
+        print('\n'.join(execucoes))
+    elif len(execucoes) < 2 and not (args.anterior and args.atual):
+        print("⚠️ São necessárias ao menos duas execuções para comparar.")
+    else:
+        anterior = args.anterior or execucoes[-2]
+        atual = args.atual or execucoes[-1]
+        print(f"🔄 {anterior} → {atual}")
+        print(diferenca(anterior, atual, args.pasta, somente_mudancas=not args.todos).to_string(index=False))
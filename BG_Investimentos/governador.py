@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+
+from metricas import contar
+
+# 🚦 Governador das chamadas ao Yahoo: limite de taxa, retentativas com jitter,
+# disjuntor (circuit breaker) e concorrência adaptativa que recua em 429.
+
+class CircuitoAberto(Exception):
+    pass
+
+def eh_limite_de_taxa(erro):
+    # yfinance sinaliza throttling com YFRateLimitError ou com "429 / Too Many Requests" na mensagem
+    texto = f'{type(erro).__name__} {erro}'.lower()
+    return 'ratelimit' in texto or '429' in texto or 'too many requests' in texto
+
+def eh_transitorio(erro):
+    # Só vale a pena repetir throttling e falhas de rede; ticker inválido falha direto
+    return eh_limite_de_taxa(erro) or isinstance(erro, OSError)
+
+class BaldeDeFichas:
+    # Token bucket: até `capacidade` chamadas de rajada, reabastece `taxa` fichas por segundo
+    def __init__(self, taxa, capacidade, relogio=time.monotonic, dormir=time.sleep):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.fichas = capacidade
+        self.relogio = relogio
+        self.dormir = dormir
+        self.ultimo = relogio()
+        self.trava = threading.Lock()
+
+    def ajustar(self, fator, minimo, maximo):
+        with self.trava:
+            self.taxa = min(maximo, max(minimo, self.taxa * fator))
+
+    def adquirir(self):
+        while True:
+            with self.trava:
+                agora = self.relogio()
+                self.fichas = min(self.capacidade, self.fichas + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return
+                espera = (1 - self.fichas) / self.taxa
+            self.dormir(espera)
+
+class Disjuntor:
+    # Abre após N falhas seguidas; depois de `recuperacao` segundos deixa passar uma chamada de teste
+    def __init__(self, limite_falhas=5, recuperacao=30.0, relogio=time.monotonic):
+        self.limite_falhas = limite_falhas
+        self.recuperacao = recuperacao
+        self.relogio = relogio
+        self.falhas = 0
+        self.aberto_em = None
+        self.testando = False
+        self.trava = threading.Lock()
+
+    def permitir(self):
+        with self.trava:
+            if self.aberto_em is None:
+                return
+            if self.relogio() - self.aberto_em >= self.recuperacao and not self.testando:
+                self.testando = True  # meio-aberto: só uma chamada de teste
+                return
+            raise CircuitoAberto("Yahoo indisponível — disjuntor aberto, aguardando recuperação")
+
+    def sucesso(self):
+        with self.trava:
+            self.falhas = 0
+            self.aberto_em = None
+            self.testando = False
+
+    def liberar(self):
+        # 429 na chamada de teste: o serviço respondeu, então devolve a vaga de teste sem reabrir
+        with self.trava:
+            self.testando = False
+
+    def falha(self):
+        with self.trava:
+            self.falhas += 1
+            if self.testando or self.falhas >= self.limite_falhas:
+                if self.aberto_em is None or self.testando:
+                    contar('governador_disjuntor_aberto_total')
+                self.aberto_em = self.relogio()
+                self.testando = False
+
+class ConcorrenciaAdaptativa:
+    # AIMD: +1 vaga a cada `janela` sucessos, metade das vagas a cada 429
+    def __init__(self, inicial=8, minimo=1, maximo=32, janela=10):
+        self.limite = inicial
+        self.minimo = minimo
+        self.maximo = maximo
+        self.janela = janela
+        self.em_uso = 0
+        self.sucessos = 0
+        self.condicao = threading.Condition()
+
+    def entrar(self):
+        with self.condicao:
+            while self.em_uso >= self.limite:
+                self.condicao.wait()
+            self.em_uso += 1
+
+    def sair(self, limitado=False):
+        with self.condicao:
+            self.em_uso -= 1
+            if limitado:
+                self.limite = max(self.minimo, self.limite // 2)
+                self.sucessos = 0
+            else:
+                self.sucessos += 1
+                if self.sucessos >= self.janela and self.limite < self.maximo:
+                    self.limite += 1
+                    self.sucessos = 0
+            self.condicao.notify_all()
+
+class Governador:
+    # 429 reduz taxa e concorrência (sem abrir o disjuntor); erros de rede contam para o disjuntor
+    def __init__(self, taxa=5.0, rajada=10, tentativas=6, espera_base=0.5, espera_max=30.0,
+                 limite_falhas=5, recuperacao=30.0, concorrencia=8, concorrencia_max=32,
+                 dormir=time.sleep, relogio=time.monotonic):
+        self.balde = BaldeDeFichas(taxa, rajada, relogio, dormir)
+        self.taxa_max = taxa
+        self.taxa_min = taxa / 20
+        self.disjuntor = Disjuntor(limite_falhas, recuperacao, relogio)
+        self.concorrencia = ConcorrenciaAdaptativa(concorrencia, 1, concorrencia_max)
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.dormir = dormir
+
+    def _espera(self, tentativa):
+        # Backoff exponencial com "full jitter"
+        return random.uniform(0, min(self.espera_max, self.espera_base * 2 ** tentativa))
+
+    def executar(self, funcao, *args, **kwargs):
+        for tentativa in range(self.tentativas):
+            self.disjuntor.permitir()
+            self.balde.adquirir()
+            self.concorrencia.entrar()
+            limitado = False
+            try:
+                resultado = funcao(*args, **kwargs)
+            except Exception as e:
+                if not eh_transitorio(e):
+                    self.disjuntor.sucesso()  # o serviço respondeu; o problema é o pedido
+                    raise
+                limitado = eh_limite_de_taxa(e)
+                if limitado:
+                    self.disjuntor.liberar()
+                    self.balde.ajustar(0.5, self.taxa_min, self.taxa_max)
+                    contar('governador_limite_taxa_total')
+                else:
+                    self.disjuntor.falha()
+                    contar('governador_falhas_total')
+                if tentativa == self.tentativas - 1:
+                    raise
+                contar('governador_retentativas_total')
+                erro = e
+            else:
+                self.disjuntor.sucesso()
+                self.balde.ajustar(1.05, self.taxa_min, self.taxa_max)
+                return resultado
+            finally:
+                self.concorrencia.sair(limitado)
+            self.dormir(self._espera(tentativa))
+        raise erro
+
+# 🔧 Instância compartilhada por coleta_dados e historico
+governador = Governador()
@@ -0,0 +1,126 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+from analise import RECOMENDACOES
+
+# 📊 Camada de gráficos: um único gráfico com um painel por indicador, em cache por versão do dataset.
+# Acima de LIMITE_BARRAS ativos, uma barra por ticker vira Top N, histograma por faixas ou dispersão WebGL,
+# então o tamanho do que vai para o navegador não cresce com o universo.
+
+CORES = {'Comprar': 'green', 'Manter': 'gold', 'Vender': 'red'}
+LIMITE_BARRAS = 60
+TOP_N = 25
+FAIXAS = 30
+ALTURA_PAINEL = 300
+
+MODOS = {
+    '🏆 Top N': 'top',
+    '📊 Distribuição': 'distribuicao',
+    '✨ Dispersão (WebGL)': 'dispersao',
+}
+
+def _colunas(df, metricas):
+    tickers = df['Ticker'].astype(str).to_numpy()
+    recomendacoes = df['Recomendação'].astype(str).to_numpy()
+    valores = {m: df[m].to_numpy(dtype='float64', na_value=np.nan) for m in metricas}
+    return tickers, recomendacoes, valores
+
+def _barras(figura, linha, tickers, recomendacoes, valores, texto, legenda):
+    for recomendacao in RECOMENDACOES:
+        filtro = recomendacoes == recomendacao
+        if not filtro.any():
+            continue
+        figura.add_trace(go.Bar(
+            x=tickers[filtro], y=valores[filtro], name=recomendacao,
+            marker_color=CORES[recomendacao], legendgroup=recomendacao, showlegend=legenda,
+            texttemplate='%{y:.2f}' if texto else None,
+        ), row=linha, col=1)
+
+def _top(figura, linha, tickers, recomendacoes, valores, top, legenda):
+    # Os N maiores valores do indicador (argpartition: sem ordenar o universo inteiro)
+    validos = np.flatnonzero(~np.isnan(valores))
+    if len(validos) > top:
+        validos = validos[np.argpartition(-valores[validos], top - 1)[:top]]
+    escolhidos = validos[np.argsort(-valores[validos], kind='stable')]
+    _barras(figura, linha, tickers[escolhidos], recomendacoes[escolhidos], valores[escolhidos], True, legenda)
+    figura.update_xaxes(categoryorder='array', categoryarray=tickers[escolhidos], row=linha, col=1)
+
+def _distribuicao(figura, linha, recomendacoes, valores, faixas, legenda):
+    # Histograma por faixas calculado aqui: o navegador recebe só faixas × recomendações
+    finitos = np.isfinite(valores)
+    if not finitos.any():
+        return
+    bordas = np.histogram_bin_edges(valores[finitos], bins=faixas)
+    centros = (bordas[:-1] + bordas[1:]) / 2
+    for recomendacao in RECOMENDACOES:
+        filtro = finitos & (recomendacoes == recomendacao)
+        if not filtro.any():
+            continue
+        contagens, _ = np.histogram(valores[filtro], bins=bordas)
+        figura.add_trace(go.Bar(
+            x=centros, y=contagens, width=np.diff(bordas), name=recomendacao,
+            marker_color=CORES[recomendacao], legendgroup=recomendacao, showlegend=legenda,
+        ), row=linha, col=1)
+
+def construir_figura(df, metricas, titulo, modo='barras', texto=False, top=TOP_N, faixas=FAIXAS):
+    tickers, recomendacoes, valores = _colunas(df, metricas)
+    if modo == 'top':
+        subtitulos = [f'{m} — Top {min(top, len(df))} de {len(df)}' for m in metricas]
+    elif modo == 'distribuicao':
+        subtitulos = [f'{m} — distribuição de {len(df)} ativos' for m in metricas]
+    else:
+        subtitulos = list(metricas)
+
+    figura = make_subplots(rows=len(metricas), cols=1, subplot_titles=subtitulos, vertical_spacing=0.12 / len(metricas) + 0.04)
+    for linha, metrica in enumerate(metricas, start=1):
+        legenda = linha == 1
+        if modo == 'top':
+            _top(figura, linha, tickers, recomendacoes, valores[metrica], top, legenda)
+        elif modo == 'distribuicao':
+            _distribuicao(figura, linha, recomendacoes, valores[metrica], faixas, legenda)
+        else:
+            _barras(figura, linha, tickers, recomendacoes, valores[metrica], texto, legenda)
+
+    figura.update_layout(
+        title=titulo, height=ALTURA_PAINEL * len(metricas), legend_title_text='Recomendação',
+        barmode='stack' if modo == 'distribuicao' else 'relative',
+    )
+    return figura
+
+def construir_dispersao(df, x, y, titulo):
+    # Um ponto por ativo em WebGL (Scattergl): leve no navegador mesmo com milhares de tickers
+    tickers, recomendacoes, valores = _colunas(df, (x, y))
+    figura = go.Figure()
+    for recomendacao in RECOMENDACOES:
+        filtro = recomendacoes == recomendacao
+        if not filtro.any():
+            continue
+        figura.add_trace(go.Scattergl(
+            x=valores[x][filtro], y=valores[y][filtro], text=tickers[filtro], mode='markers', name=recomendacao,
+            marker=dict(color=CORES[recomendacao], size=6),
+            hovertemplate='%{text}<br>' + x + ': %{x:.2f}<br>' + y + ': %{y:.2f}<extra></extra>',
+        ))
+    figura.update_layout(title=titulo, xaxis_title=x, yaxis_title=y, legend_title_text='Recomendação', height=ALTURA_PAINEL * 2)
+    return figura
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def figura_do_dataset(versao, _df, metricas, titulo, modo, texto=False):
+    # Figuras prontas compartilhadas entre reruns e sessões; a versão vem de carregamento.py
+    if modo == 'dispersao':
+        return construir_dispersao(_df, metricas[0], metricas[1], titulo)
+    return construir_figura(_df, metricas, titulo, modo, texto)
+
+def mostrar_indicadores(df, metricas, titulo, chave, texto=False):
+    metricas = tuple(m for m in metricas if m in df.columns)
+    modo = 'barras'
+    if len(df) > LIMITE_BARRAS:
+        opcoes = MODOS if len(metricas) > 1 else {k: v for k, v in MODOS.items() if v != 'dispersao'}
+        modo = opcoes[st.radio(f"Visualização ({len(df)} ativos):", list(opcoes), horizontal=True, key=f'grafico_{chave}')]
+    versao = df.attrs.get('versao')
+    if versao is None:
+        figura = construir_dispersao(df, *metricas[:2], titulo) if modo == 'dispersao' else construir_figura(df, metricas, titulo, modo, texto)
+    else:
+        figura = figura_do_dataset(versao, df, metricas, titulo, modo, texto)
+    st.plotly_chart(figura, use_container_width=True)
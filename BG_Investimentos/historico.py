@@ -0,0 +1,125 @@
+import argparse
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from armazenamento import PARQUET_DISPONIVEL
+from governador import governador
+
+# 🗂️ Histórico diário OHLCV — um arquivo por ticker em ./dados/historico/
+PASTA_HISTORICO = './dados/historico'
+INICIO_PADRAO = '2015-01-01'
+EXTENSAO = '.parquet' if PARQUET_DISPONIVEL else '.csv'
+
+COLUNAS = {
+    'Open': 'Abertura',
+    'High': 'Máxima',
+    'Low': 'Mínima',
+    'Close': 'Fechamento',
+    'Adj Close': 'Fechamento Ajustado',
+    'Volume': 'Volume',
+}
+
+def _caminho(ticker, pasta):
+    return os.path.join(pasta, f'{ticker}{EXTENSAO}')
+
+def _ler(caminho, colunas=None):
+    if caminho.endswith('.parquet'):
+        return pd.read_parquet(caminho, columns=colunas)
+    return pd.read_csv(caminho, usecols=colunas, parse_dates=['Data'])
+
+def _gravar(df, caminho):
+    temporario = caminho + '.tmp'
+    if caminho.endswith('.parquet'):
+        df.to_parquet(temporario, index=False, compression='zstd')
+    else:
+        df.to_csv(temporario, index=False)
+    os.replace(temporario, caminho)
+
+# 📄 Leitura de uma série
+def ler_historico(ticker, inicio=None, fim=None, pasta=PASTA_HISTORICO):
+    caminho = _caminho(ticker, pasta)
+    if not os.path.exists(caminho):
+        return pd.DataFrame(columns=['Data', *COLUNAS.values()])
+    df = _ler(caminho)
+    if inicio is not None:
+        df = df[df['Data'] >= pd.Timestamp(inicio)]
+    if fim is not None:
+        df = df[df['Data'] <= pd.Timestamp(fim)]
+    return df.reset_index(drop=True)
+
+def ultima_data(ticker, pasta=PASTA_HISTORICO):
+    caminho = _caminho(ticker, pasta)
+    if not os.path.exists(caminho):
+        return None
+    datas = _ler(caminho, ['Data'])['Data']
+    return datas.max() if len(datas) else None
+
+def _normalizar(bruto):
+    df = bruto.rename(columns=COLUNAS).dropna(subset=['Fechamento'])
+    df = df[[c for c in COLUNAS.values() if c in df.columns]]
+    df = df.rename_axis('Data').reset_index()
+    df['Data'] = pd.to_datetime(df['Data']).dt.tz_localize(None)
+    precos = [c for c in df.columns if c not in ('Data', 'Volume')]
+    df[precos] = df[precos].astype('float32')
+    return df
+
+def _anexar(ticker, novos, pasta):
+    # Junta com o que já existe e remove datas repetidas (o último download vence)
+    caminho = _caminho(ticker, pasta)
+    if os.path.exists(caminho):
+        novos = pd.concat([_ler(caminho), novos], ignore_index=True)
+    novos = novos.drop_duplicates('Data', keep='last').sort_values('Data', ignore_index=True)
+    _gravar(novos, caminho)
+    return len(novos)
+
+# 🔄 Atualização incremental com downloads em lote
+def atualizar_historico(tickers, inicio_padrao=INICIO_PADRAO, tamanho_lote=50, pasta=PASTA_HISTORICO):
+    import yfinance as yf  # import tardio: quem só lê o histórico (ex.: backtest) não precisa do yfinance
+    os.makedirs(pasta, exist_ok=True)
+    hoje = date.today()
+
+    # Agrupa pelo próximo dia a baixar: tickers em dia entram no mesmo download
+    grupos = {}
+    for ticker in tickers:
+        ultima = ultima_data(ticker, pasta)
+        inicio = (ultima.date() + timedelta(days=1)) if ultima is not None else pd.Timestamp(inicio_padrao).date()
+        if inicio <= hoje:
+            grupos.setdefault(inicio, []).append(ticker)
+
+    barras = {}
+    for inicio, grupo in grupos.items():
+        for i in range(0, len(grupo), tamanho_lote):
+            lote = grupo[i:i + tamanho_lote]
+            bruto = governador.executar(
+                yf.download, lote, start=inicio.isoformat(), end=(hoje + timedelta(days=1)).isoformat(),
+                group_by='ticker', auto_adjust=False, threads=True, progress=False
+            )
+            if bruto is None or bruto.empty:
+                continue
+            for ticker in lote:
+                if isinstance(bruto.columns, pd.MultiIndex):
+                    if ticker not in bruto.columns.get_level_values(0):
+                        continue
+                    serie = bruto[ticker]
+                else:
+                    serie = bruto
+                novos = _normalizar(serie)
+                novos = novos[novos['Data'].dt.date >= inicio]
+                if not novos.empty:
+                    _anexar(ticker, novos, pasta)
+                    barras[ticker] = len(novos)
+    return barras
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Atualiza o histórico diário de preços (OHLCV)")
+    parser.add_argument('--simbolos', default='./dados/ativos_b3.csv', help="CSV com coluna Ticker")
+    parser.add_argument('--inicio', default=INICIO_PADRAO, help="data inicial para tickers sem histórico")
+    parser.add_argument('--lote', type=int, default=50, help="tickers por download")
+    parser.add_argument('--pasta', default=PASTA_HISTORICO)
+    args = parser.parse_args()
+
+    tickers = [t if t.endswith('.SA') else f'{t}.SA' for t in pd.read_csv(args.simbolos, dtype=str)['Ticker'].str.strip()]
+    barras = atualizar_historico(tickers, args.inicio, args.lote, args.pasta)
+    print(f"✅ {sum(barras.values())} barras novas em {len(barras)} de {len(tickers)} tickers")
@@ -0,0 +1,159 @@
+import codecs
+import csv
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pandas.api.types import union_categoricals
+
+from armazenamento import NUMERO, SCHEMAS, TEXTO, aplicar_schema
+
+# 📥 Ingestão de CSV enviado: cabeçalho validado antes de ler o corpo, leitura em blocos com
+# schema declarado, números no formato brasileiro (1.234,56) e linhas ruins em quarentena com o motivo.
+
+TAMANHO_BLOCO = 50_000
+MAX_QUARENTENA = 10_000
+
+# Colunas sem as quais a Recomendação não pode ser calculada
+OBRIGATORIAS = {
+    'acoes': ('Ticker', 'Upside (%)', 'Dividend Yield (%)', 'ROE (%)'),
+    'fiis': ('Ticker', 'P/VP', 'Dividend Yield (%)', 'Vacância (%)'),
+}
+SINONIMOS = {
+    'acoes': {'DY (%)': 'Dividend Yield (%)'},
+    'fiis': {},
+}
+
+class ErroCabecalho(ValueError):
+    pass
+
+def _texto(arquivo):
+    # Decodifica em streaming; UTF-8 (com ou sem BOM) e, se falhar, Latin-1 (exportação do Excel)
+    arquivo.seek(0)
+    amostra = arquivo.read(64 * 1024)
+    arquivo.seek(0)
+    try:
+        # Decodificador incremental: um caractere multibyte cortado no fim da amostra não conta como erro
+        codecs.getincrementaldecoder('utf-8-sig')().decode(amostra, final=False)
+        codificacao = 'utf-8-sig'
+    except UnicodeDecodeError:
+        codificacao = 'latin-1'
+    return io.TextIOWrapper(arquivo, encoding=codificacao, newline='')
+
+def ler_cabecalho(texto, tipo):
+    # Só a primeira linha: separador (',' ou ';'), nomes das colunas e validação contra o schema.
+    # Devolve as colunas a ler por posição ({índice: nome no schema}) — nomes com espaços ou repetidos
+    # não precisam bater com o que o parser do pandas entende — e quantos campos o cabeçalho tem.
+    linha = texto.readline()
+    texto.seek(0)
+    if not linha.strip():
+        raise ErroCabecalho("Arquivo vazio: nenhuma linha de cabeçalho encontrada.")
+    separador = ';' if linha.count(';') > linha.count(',') else ','
+    colunas = [c.strip() for c in next(csv.reader([linha], delimiter=separador))]
+    nomes = [SINONIMOS[tipo].get(c, c) for c in colunas]
+    faltando = [c for c in OBRIGATORIAS[tipo] if c not in nomes]
+    if faltando:
+        raise ErroCabecalho(
+            f"Colunas obrigatórias ausentes: {', '.join(faltando)}. Encontradas: {', '.join(colunas) or '(nenhuma)'}")
+    # Só as colunas do schema são lidas (a primeira, se repetida); as demais são ignoradas
+    usar = {}
+    for indice, nome in enumerate(nomes):
+        if nome in SCHEMAS[tipo] and nome not in usar.values():
+            usar[indice] = nome
+    return separador, usar, len(colunas)
+
+def converter_numeros(valores):
+    # Vetorizado: "1.234,56" → 1234.56, "8,2%" → 8.2, "R$ 9,50" → 9.5; vazio vira NaN
+    texto = valores.astype('string').str.strip().str.replace(r'[%\s]|R\$', '', regex=True)
+    decimal_virgula = texto.str.contains(',', regex=False, na=False)
+    texto = texto.mask(decimal_virgula, texto.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    texto = texto.mask(texto == '')
+    try:
+        # Caminho rápido: bloco todo numérico converte direto
+        return texto.astype('float64').to_numpy(), np.zeros(len(texto), dtype=bool)
+    except (ValueError, TypeError):
+        numeros = pd.to_numeric(texto, errors='coerce')
+        invalidos = numeros.isna() & texto.notna()
+        return numeros.to_numpy(dtype='float64', na_value=np.nan), invalidos.to_numpy(dtype=bool)
+
+def _validar_bloco(bloco, tipo, excedentes=None):
+    motivos = np.full(len(bloco), '', dtype=object)
+
+    def marcar(filtro, motivo):
+        novos = filtro & (motivos == '')
+        motivos[novos] = motivo
+
+    if excedentes is not None:
+        marcar(excedentes, 'Mais campos que o cabeçalho')
+    ticker = bloco['Ticker'].astype('string').str.strip().str.upper()
+    marcar(ticker.fillna('').eq('').to_numpy(dtype=bool), 'Ticker vazio')
+    bloco['Ticker'] = ticker
+    for coluna, dtype in SCHEMAS[tipo].items():
+        if coluna not in bloco.columns:
+            continue
+        if dtype == NUMERO:
+            numeros, invalidos = converter_numeros(bloco[coluna])
+            bloco[coluna] = numeros.astype(NUMERO)
+            marcar(invalidos, f'Valor não numérico em {coluna}')
+        else:
+            # Texto vira categoria já no bloco: o acumulado não guarda uma string por linha
+            bloco[coluna] = bloco[coluna].astype('string').str.strip().astype(TEXTO)
+    return bloco, motivos
+
+def _juntar(blocos, colunas):
+    if not blocos:
+        return pd.DataFrame(columns=colunas)
+    juntos = {}
+    for coluna in colunas:
+        partes = [b[coluna] for b in blocos]
+        if isinstance(partes[0].dtype, pd.CategoricalDtype):
+            juntos[coluna] = union_categoricals([p.array for p in partes])
+        else:
+            juntos[coluna] = np.concatenate([p.to_numpy() for p in partes])
+    return pd.DataFrame(juntos)
+
+def ler_csv(arquivo, tipo, tamanho_bloco=TAMANHO_BLOCO, ao_progresso=None):
+    # Devolve (df com schema, quarentena com Linha/Motivo, resumo); só um bloco de texto por vez na memória
+    texto = _texto(arquivo)
+    try:
+        separador, usar, campos = ler_cabecalho(texto, tipo)
+        arquivo.seek(0, io.SEEK_END)
+        tamanho = arquivo.tell() or 1
+        texto.seek(0)
+
+        # Uma coluna além do cabeçalho: preenchida só em linhas com campos a mais, que vão para a quarentena
+        # (index_col=False: o pandas não usa o campo extra como índice; o aviso que ele emite é silenciado)
+        leitor = pd.read_csv(texto, sep=separador, header=None, skiprows=1, names=range(campos + 1),
+                             index_col=False, dtype=str, keep_default_na=False, na_values=[''],
+                             chunksize=tamanho_bloco, skipinitialspace=True)
+        validos, quarentena = [], []
+        total = em_quarentena = guardadas = 0
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', pd.errors.ParserWarning)
+            for bloco in leitor:
+                excedentes = bloco[campos].notna().to_numpy()
+                bloco = bloco[list(usar)].rename(columns=usar)
+                originais = bloco.copy() if guardadas < MAX_QUARENTENA else None
+                bloco, motivos = _validar_bloco(bloco, tipo, excedentes)
+                ruins = motivos != ''
+                if ruins.any():
+                    em_quarentena += int(ruins.sum())
+                    if originais is not None:
+                        # Linha no arquivo: +2 (cabeçalho e contagem a partir de 1)
+                        separadas = originais[ruins].assign(Linha=np.flatnonzero(ruins) + total + 2,
+                                                            Motivo=motivos[ruins]).head(MAX_QUARENTENA - guardadas)
+                        quarentena.append(separadas)
+                        guardadas += len(separadas)
+                validos.append(bloco[~ruins])
+                total += len(bloco)
+                if ao_progresso is not None:
+                    ao_progresso(min(texto.buffer.tell() / tamanho, 1.0), total)
+    finally:
+        texto.detach()  # devolve o arquivo aberto para quem chamou, mesmo se a leitura falhar
+
+    df = aplicar_schema(_juntar(validos, list(usar.values())), tipo)
+    quarentena = pd.concat(quarentena, ignore_index=True) if quarentena else pd.DataFrame(columns=['Linha', 'Motivo'])
+    resumo = {'linhas': total, 'validas': len(df), 'quarentena': em_quarentena, 'separador': separador}
+    return df, quarentena, resumo
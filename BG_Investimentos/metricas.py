@@ -0,0 +1,159 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# 📊 Registro de métricas do processo (contadores + histogramas de tempo)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_trava = threading.Lock()
+_contadores = {}
+_histogramas = {}
+
+# 🔬 Perfil opcional (cProfile) — guarda só o da etapa mais lenta
+_perfil = {'ativo': False, 'etapa': None, 'segundos': 0.0, 'perfil': None, 'threads': []}
+_local = threading.local()
+
+def contar(nome, valor=1):
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + valor
+
+def observar(nome, segundos):
+    with _trava:
+        h = _histogramas.setdefault(nome, {'contagem': 0, 'soma': 0.0, 'max': 0.0, 'buckets': [0] * len(BUCKETS)})
+        h['contagem'] += 1
+        h['soma'] += segundos
+        h['max'] = max(h['max'], segundos)
+        for i, limite in enumerate(BUCKETS):
+            if segundos <= limite:
+                h['buckets'][i] += 1
+
+def ativar_perfil(ativo=True):
+    _perfil['ativo'] = ativo
+
+@contextmanager
+def cronometrar(nome):
+    # Só a etapa mais externa da thread principal é perfilada (cProfile não aninha)
+    perfilar = (
+        _perfil['ativo']
+        and threading.current_thread() is threading.main_thread()
+        and not getattr(_local, 'perfilando', False)
+    )
+    perfil = cProfile.Profile() if perfilar else None
+    if perfil is not None:
+        _local.perfilando = True
+        perfil.enable()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        observar(nome, segundos)
+        if perfil is not None:
+            perfil.disable()
+            _local.perfilando = False
+            with _trava:
+                if segundos > _perfil['segundos']:
+                    _perfil.update(etapa=nome, segundos=segundos, perfil=perfil)
+
+def perfilar_threads(funcao):
+    # cProfile só enxerga a thread em que foi ligado: com o perfil ativo, cada chamada de `funcao`
+    # nas threads do pool ganha o próprio perfil, somados num _threads.prof na exportação
+    @wraps(funcao)
+    def perfilada(*args, **kwargs):
+        if not _perfil['ativo'] or threading.current_thread() is threading.main_thread():
+            return funcao(*args, **kwargs)
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:  # outro profiler já ativo (Python 3.12+ só permite um por vez)
+            return funcao(*args, **kwargs)
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            perfil.disable()
+            with _trava:
+                _perfil['threads'].append(perfil)
+    return perfilada
+
+# 🚀 Tempo até a primeira tela do app (run_app grava o instante do lançamento em BG_INICIO_APP)
+_primeira_tela = {'registrada': False}
+
+def registrar_primeira_tela(pasta='./relatorios/metricas'):
+    inicio = os.environ.get('BG_INICIO_APP')
+    with _trava:
+        if inicio is None or _primeira_tela['registrada']:
+            return None
+        _primeira_tela['registrada'] = True
+    segundos = time.time() - float(inicio)
+    observar('app_primeira_tela', segundos)
+    print(f"🚀 Primeira tela em {segundos:.2f}s")
+    os.makedirs(pasta, exist_ok=True)
+    with open(os.path.join(pasta, 'inicio_app.jsonl'), 'a', encoding='utf-8') as arquivo:
+        arquivo.write(json.dumps({'data': datetime.now().isoformat(timespec='seconds'), 'segundos': segundos}) + '\n')
+    return segundos
+
+def taxa_acerto_cache():
+    acertos = _contadores.get('cache_acertos_total', 0) + _contadores.get('cache_obsoletos_total', 0)
+    total = acertos + _contadores.get('cache_falhas_total', 0)
+    return acertos / total if total else None
+
+def resumo():
+    with _trava:
+        return {
+            'contadores': dict(_contadores),
+            'histogramas': {
+                nome: {**h, 'media': h['soma'] / h['contagem'] if h['contagem'] else 0.0}
+                for nome, h in _histogramas.items()
+            },
+            'taxa_acerto_cache': taxa_acerto_cache(),
+        }
+
+def zerar():
+    with _trava:
+        _contadores.clear()
+        _histogramas.clear()
+        _perfil.update(etapa=None, segundos=0.0, perfil=None, threads=[])
+
+def _prometheus(dados):
+    linhas = []
+    for nome, valor in sorted(dados['contadores'].items()):
+        linhas += [f'# TYPE bg_{nome} counter', f'bg_{nome} {valor}']
+    for nome, h in sorted(dados['histogramas'].items()):
+        linhas.append(f'# TYPE bg_{nome}_segundos histogram')
+        for limite, quantidade in zip(BUCKETS, h['buckets']):
+            linhas.append(f'bg_{nome}_segundos_bucket{{le="{limite}"}} {quantidade}')
+        linhas.append(f'bg_{nome}_segundos_bucket{{le="+Inf"}} {h["contagem"]}')
+        linhas.append(f'bg_{nome}_segundos_sum {h["soma"]}')
+        linhas.append(f'bg_{nome}_segundos_count {h["contagem"]}')
+    if dados['taxa_acerto_cache'] is not None:
+        linhas += ['# TYPE bg_cache_taxa_acerto gauge', f'bg_cache_taxa_acerto {dados["taxa_acerto_cache"]}']
+    return '\n'.join(linhas) + '\n'
+
+# 💾 Exporta um arquivo por execução: JSON + texto Prometheus (+ .prof da etapa mais lenta
+# e _threads.prof com o trabalho das threads perfiladas)
+def exportar_metricas(pasta='./relatorios/metricas', nome='execucao'):
+    os.makedirs(pasta, exist_ok=True)
+    base = os.path.join(pasta, f"{nome}_{datetime.now():%Y%m%d_%H%M%S}")
+    dados = resumo()
+
+    with open(base + '.json', 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    with open(base + '.prom', 'w', encoding='utf-8') as arquivo:
+        arquivo.write(_prometheus(dados))
+
+    arquivos = [base + '.json', base + '.prom']
+    if _perfil['perfil'] is not None:
+        _perfil['perfil'].dump_stats(base + '.prof')
+        arquivos.append(base + '.prof')
+    with _trava:
+        perfis = list(_perfil['threads'])
+    if perfis:
+        pstats.Stats(*perfis).dump_stats(base + '_threads.prof')
+        arquivos.append(base + '_threads.prof')
+    return arquivos
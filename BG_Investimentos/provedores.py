@@ -0,0 +1,124 @@
+import json
+import os
+
+from governador import governador
+
+# 🔌 Provedores de dados — a coleta pede só os campos que a análise usa.
+# Escolha com a variável de ambiente BG_PROVEDOR (yfinance | fixture).
+
+class ProvedorYFinance:
+    nome = 'yfinance'
+
+    def __init__(self):
+        import yfinance as yf  # import tardio: o modo offline não precisa do yfinance
+        self.yf = yf
+
+    def cotacao(self, ticker):
+        # fast_info: caminho leve, só o preço (sem o payload completo do .info)
+        fast = governador.executar(lambda: self.yf.Ticker(ticker).fast_info)
+        return governador.executar(lambda: fast.last_price) or 0
+
+    def fundamentos(self, ticker, campos):
+        info = governador.executar(lambda: self.yf.Ticker(ticker).info)
+        return {campo: info.get(campo) for campo in campos}
+
+class ProvedorFixture:
+    # Snapshot local em JSON: {"ITSA4.SA": {"currentPrice": 9.5, "trailingPE": 8.5, ...}, ...}
+    nome = 'fixture'
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or os.environ.get('BG_SNAPSHOT', './dados/snapshot_fundamentos.json')
+        with open(self.caminho, encoding='utf-8') as arquivo:
+            self.dados = json.load(arquivo)
+
+    def _registro(self, ticker):
+        if ticker not in self.dados:
+            raise KeyError(f"{ticker} não está no snapshot {self.caminho}")
+        return self.dados[ticker]
+
+    def cotacao(self, ticker):
+        return self._registro(ticker).get('currentPrice') or 0
+
+    def fundamentos(self, ticker, campos):
+        registro = self._registro(ticker)
+        return {campo: registro.get(campo) for campo in campos}
+
+PROVEDORES = {
+    'yfinance': ProvedorYFinance,
+    'fixture': ProvedorFixture,
+}
+
+_provedor = {'atual': None}
+
+def provedor_padrao():
+    if _provedor['atual'] is None:
+        _provedor['atual'] = PROVEDORES[os.environ.get('BG_PROVEDOR', 'yfinance')]()
+    return _provedor['atual']
+
+def definir_provedor(provedor):
+    # Troca o provedor do processo (testes, benchmark, app offline)
+    _provedor['atual'] = provedor
+
+# 📸 Grava um snapshot a partir de um provedor (ex.: yfinance) para uso offline
+def gravar_snapshot(tickers, campos, caminho='./dados/snapshot_fundamentos.json', provedor=None):
+    provedor = provedor or provedor_padrao()
+    snapshot = {}
+    for ticker in tickers:
+        try:
+            snapshot[ticker] = provedor.fundamentos(ticker, campos)
+        except Exception as e:
+            print(f"⚠️ {ticker}: {e}")
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(snapshot, arquivo, ensure_ascii=False, indent=2)
+    return len(snapshot)
+
+def snapshot_de_csv(pasta='./dados', caminho='./dados/snapshot_fundamentos.json'):
+    # Monta o snapshot a partir de dados/acoes.csv e dados/fiis.csv (sem rede)
+    import pandas as pd
+    snapshot = {}
+    for linha in pd.read_csv(os.path.join(pasta, 'acoes.csv')).to_dict('records'):
+        # LPA = preço / (P/L), VPA = LPA / ROE, dividendo = DY × preço
+        lpa = linha['Preço Atual'] / linha['P/L'] if linha['P/L'] else None
+        roe = linha['ROE (%)'] / 100
+        snapshot[f"{linha['Ticker']}.SA"] = {
+            'currentPrice': linha['Preço Atual'],
+            'trailingPE': linha['P/L'],
+            'dividendYield': round(linha['Dividend Yield (%)'] / 100, 6),
+            'returnOnEquity': round(roe, 6),
+            'profitMargins': None,
+            'trailingEps': round(lpa, 4) if lpa else None,
+            'bookValue': round(lpa / roe, 4) if lpa and roe else None,
+            'dividendRate': round(linha['Dividend Yield (%)'] / 100 * linha['Preço Atual'], 4),
+            'freeCashflow': None,
+            'sharesOutstanding': None,
+        }
+    for linha in pd.read_csv(os.path.join(pasta, 'fiis.csv')).to_dict('records'):
+        snapshot[f"{linha['Ticker']}.SA"] = {
+            'currentPrice': None,
+            'priceToBook': linha['P/VP'],
+            'dividendYield': round(linha['Dividend Yield (%)'] / 100, 6),
+            'dividendRate': round(linha['Renda Mensal (R$)'] * 12, 6),
+            'industry': linha['Setor'],
+        }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(snapshot, arquivo, ensure_ascii=False, indent=2)
+    return len(snapshot)
+
+if __name__ == '__main__':
+    import argparse
+    import pandas as pd
+    from coleta_dados import CAMPOS_ACOES, CAMPOS_FIIS
+
+    parser = argparse.ArgumentParser(description="Gera o snapshot local usado pelo provedor 'fixture'")
+    parser.add_argument('--de-csv', action='store_true', help="usa dados/acoes.csv e dados/fiis.csv em vez do yfinance")
+    parser.add_argument('--simbolos', default='./dados/ativos_b3.csv')
+    parser.add_argument('--saida', default='./dados/snapshot_fundamentos.json')
+    args = parser.parse_args()
+
+    if args.de_csv:
+        total = snapshot_de_csv(caminho=args.saida)
+    else:
+        tickers = [f'{t}.SA' for t in pd.read_csv(args.simbolos, dtype=str)['Ticker'].str.strip()]
+        campos = sorted(set(CAMPOS_ACOES) | set(CAMPOS_FIIS))
+        total = gravar_snapshot(tickers, campos, args.saida)
+    print(f"✅ Snapshot com {total} ativos salvo em {args.saida}")
@@ -0,0 +1,67 @@
+import os
+import shutil
+from datetime import datetime
+
+from armazenamento import PARQUET_DISPONIVEL, salvar_tabela
+
+# 📦 Datasets publicados: cada rodada do atualizador vira uma pasta imutável dados/publicado/<versão>/
+# e o arquivo ATUAL aponta para a última. Dashboards só leem a versão apontada — nunca coletam.
+
+PASTA_PUBLICACAO = 'publicado'
+ARQUIVO_ATUAL = 'ATUAL'
+MANTER_VERSOES = 5
+FORMATO_VERSAO = '%Y%m%dT%H%M%S%f'  # microssegundos: duas publicações no mesmo segundo não colidem
+
+def _raiz(pasta):
+    return os.path.join(pasta, PASTA_PUBLICACAO)
+
+def versao_atual(pasta='./dados'):
+    try:
+        with open(os.path.join(_raiz(pasta), ARQUIVO_ATUAL), encoding='utf-8') as arquivo:
+            return arquivo.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def data_da_versao(versao):
+    # Versões publicadas antes dos microssegundos têm só 15 caracteres (AAAAMMDDTHHMMSS)
+    return datetime.strptime(versao, FORMATO_VERSAO if len(versao) > 15 else '%Y%m%dT%H%M%S')
+
+def caminho_atual(tipo, pasta='./dados'):
+    # Arquivo da última versão publicada; sem publicação, o dados/<tipo>.csv de sempre
+    versao = versao_atual(pasta)
+    if versao is not None:
+        for extensao in ('.parquet', '.csv'):
+            caminho = os.path.join(_raiz(pasta), versao, f'{tipo}{extensao}')
+            if os.path.exists(caminho):
+                return caminho
+    return os.path.join(pasta, f'{tipo}.csv')
+
+def publicar_versao(tabelas, pasta='./dados', manter=MANTER_VERSOES):
+    # Monta a versão numa pasta temporária, renomeia de uma vez e só então troca o ponteiro ATUAL
+    raiz = _raiz(pasta)
+    versao = datetime.now().strftime(FORMATO_VERSAO)
+    if os.path.exists(os.path.join(raiz, versao)):
+        raise FileExistsError(f"Versão {versao} já publicada — uma versão nunca é sobrescrita")
+    temporaria = os.path.join(raiz, f'.tmp_{versao}')
+    os.makedirs(raiz, exist_ok=True)
+    os.mkdir(temporaria)  # falha se outro processo estiver montando a mesma versão
+    extensao = '.parquet' if PARQUET_DISPONIVEL else '.csv'
+    for tipo, df in tabelas.items():
+        salvar_tabela(df, os.path.join(temporaria, f'{tipo}{extensao}'), tipo)
+    os.replace(temporaria, os.path.join(raiz, versao))
+
+    ponteiro = os.path.join(raiz, f'.tmp_{ARQUIVO_ATUAL}')
+    with open(ponteiro, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(versao)
+    os.replace(ponteiro, os.path.join(raiz, ARQUIVO_ATUAL))
+
+    # Versões antigas saem depois da troca (as últimas ficam para quem ainda está lendo)
+    for antiga in listar_versoes(pasta)[:-manter]:
+        shutil.rmtree(os.path.join(raiz, antiga), ignore_errors=True)
+    return versao
+
+def listar_versoes(pasta='./dados'):
+    raiz = _raiz(pasta)
+    if not os.path.isdir(raiz):
+        return []
+    return sorted(nome for nome in os.listdir(raiz) if not nome.startswith('.') and os.path.isdir(os.path.join(raiz, nome)))
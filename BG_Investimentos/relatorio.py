@@ -0,0 +1,111 @@
+import csv
+import os
+from contextlib import contextmanager
+
+from metricas import contar, cronometrar
+
+# 📝 Escritores em streaming — cada linha vai para o arquivo assim que é classificada.
+# Use sempre com "with": se a execução falhar no meio, o arquivo é fechado com as
+# linhas já escritas (o CSV ainda faz flush linha a linha e sobrevive até a um kill).
+
+class EscritorCSV:
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, 'w', newline='', encoding='utf-8')
+        self.escritor = None
+
+    def escrever(self, linha):
+        if self.escritor is None:
+            self.escritor = csv.DictWriter(self.arquivo, fieldnames=list(linha))
+            self.escritor.writeheader()
+        self.escritor.writerow(linha)
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.arquivo.close()
+
+class EscritorExcel:
+    def __init__(self, caminho):
+        from openpyxl import Workbook
+        self.caminho = caminho
+        self.planilha = Workbook(write_only=True)  # modo streaming do openpyxl
+        self.aba = self.planilha.create_sheet('Relatório')
+        self.colunas = None
+
+    def escrever(self, linha):
+        if self.colunas is None:
+            self.colunas = list(linha)
+            self.aba.append(self.colunas)
+        self.aba.append([linha.get(c) for c in self.colunas])
+
+    def fechar(self):
+        self.planilha.save(self.caminho)
+
+class EscritorParquet:
+    # O schema sai do primeiro lote, mas toda coluna numérica vira float64 (ou o tipo dado em `tipos`):
+    # um 0 inferido como int64 no primeiro lote não pode quebrar um 12.5 num lote seguinte
+    def __init__(self, caminho, tamanho_lote=1000, tipos=None):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.tipos = tipos or {}
+        self.lote = []
+        self.escritor = None
+
+    def escrever(self, linha):
+        self.lote.append(linha)
+        if len(self.lote) >= self.tamanho_lote:
+            self._descarregar()
+
+    def _descarregar(self):
+        if not self.lote:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self.escritor is None:
+            self.escritor = pq.ParquetWriter(self.caminho, self._schema(pa.Table.from_pylist(self.lote).schema),
+                                             compression='zstd')
+        self.escritor.write_table(pa.Table.from_pylist(self.lote, schema=self.escritor.schema))
+        self.lote = []
+
+    def _schema(self, inferido):
+        import pyarrow as pa
+        numerico = (pa.types.is_integer, pa.types.is_floating, pa.types.is_null)
+        return pa.schema([
+            pa.field(campo.name, self.tipos.get(campo.name)
+                     or (pa.float64() if any(e(campo.type) for e in numerico) else campo.type))
+            for campo in inferido
+        ])
+
+    def fechar(self):
+        self._descarregar()
+        if self.escritor is not None:
+            self.escritor.close()
+
+ESCRITORES = {
+    '.csv': EscritorCSV,
+    '.xlsx': EscritorExcel,
+    '.parquet': EscritorParquet,
+}
+
+@contextmanager
+def abrir_relatorio(caminho):
+    # Escolhe o escritor pela extensão do arquivo
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao not in ESCRITORES:
+        raise ValueError(f"Formato de relatório não suportado: {extensao}")
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    escritor = ESCRITORES[extensao](caminho)
+    escrever = escritor.escrever
+
+    def escrever_medindo(linha):
+        with cronometrar('relatorio_escrever_linha'):
+            escrever(linha)
+        contar('relatorio_linhas_total')
+
+    escritor.escrever = escrever_medindo
+    try:
+        yield escritor
+    finally:
+        with cronometrar('relatorio_fechar'):
+            escritor.fechar()
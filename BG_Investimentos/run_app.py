@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+# 🚀 Lançador do BG PRO — sobe o Streamlit no próprio processo (sem "os.system"/shell)
+# e abre a partir do snapshot de dados empacotado, sem acessar a rede.
+#   python run_app.py            → modo rápido (snapshot local)
+#   python run_app.py --ao-vivo  → usa o yfinance e a pasta BG_Investimentos/dados (só a partir do código-fonte:
+#                                  o executável não empacota o yfinance, ver run_app.spec)
+
+os.environ.setdefault('BG_INICIO_APP', str(time.time()))
+
+def pasta_base():
+    # No executável do PyInstaller os arquivos ficam em sys._MEIPASS
+    return getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    base = pasta_base()
+    ao_vivo = '--ao-vivo' in sys.argv
+
+    if ao_vivo and getattr(sys, 'frozen', False):
+        print("❌ --ao-vivo não está disponível no executável (o yfinance não é empacotado). "
+              "Rode 'python run_app.py --ao-vivo' a partir do código-fonte.")
+        sys.exit(2)
+
+    if not ao_vivo:
+        os.environ.setdefault('BG_PROVEDOR', 'fixture')
+        os.environ.setdefault('BG_SNAPSHOT', os.path.join(base, 'dados', 'snapshot_fundamentos.json'))
+        os.environ.setdefault('BG_DADOS', os.path.join(base, 'dados'))
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = [
+        'streamlit', 'run', os.path.join(base, 'dashboard_bg_pro.py'),
+        '--global.developmentMode=false',
+        '--server.fileWatcherType=none',
+        '--browser.gatherUsageStats=false',
+    ]
+    print(f"⏱️ Streamlit importado em {time.time() - float(os.environ['BG_INICIO_APP']):.2f}s")
+    sys.exit(stcli.main())
+
+if __name__ == '__main__':
+    main()
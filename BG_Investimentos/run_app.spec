@@ -0,0 +1,66 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Build: python armazenamento.py (gera dados/*.parquet) && pyinstaller run_app.spec
+from PyInstaller.utils.hooks import collect_data_files, copy_metadata
+
+# 📦 O dashboard é executado pelo Streamlit a partir do arquivo .py, então os módulos
+# do projeto e o snapshot de dados vão como "datas" ao lado do executável.
+MODULOS = [
+    'dashboard_bg_pro.py', 'analise.py', 'armazenamento.py', 'carregamento.py',
+    'tabelas.py', 'agregados.py', 'metricas.py', 'provedores.py', 'governador.py',
+    'graficos.py', 'execucoes.py', 'publicacao.py', 'ingestao.py', 'relatorio.py',
+]
+DADOS = [
+    ('dados/acoes.csv', 'dados'),
+    ('dados/fiis.csv', 'dados'),
+    ('dados/acoes.parquet', 'dados'),
+    ('dados/fiis.parquet', 'dados'),
+    ('dados/snapshot_fundamentos.json', 'dados'),
+]
+
+a = Analysis(
+    ['run_app.py'],
+    pathex=[],
+    binaries=[],
+    datas=[(m, '.') for m in MODULOS] + DADOS + collect_data_files('streamlit') + copy_metadata('streamlit'),
+    hiddenimports=['plotly.express', 'plotly.graph_objects', 'plotly.subplots', 'pyarrow', 'pyarrow.parquet', 'streamlit.web.cli'],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    # O app empacotado lê o snapshot local: nada de yfinance nem bibliotecas de GUI/notebook
+    excludes=['yfinance', 'tkinter', 'matplotlib', 'IPython', 'notebook', 'jupyter', 'pytest', 'scipy', 'PyQt5', 'PySide2'],
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='run_app',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    # Com console: o Streamlit roda neste processo, e os avisos do lançador (tempo de import, --ao-vivo
+    # recusado) e o log do servidor só aparecem nele; fechar a janela encerra o app
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+# 📁 Modo pasta (onedir): sem descompactar tudo num diretório temporário a cada abertura
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='run_app',
+)
@@ -0,0 +1,140 @@
+import argparse
+import os
+import time
+from functools import partial
+
+import pandas as pd
+
+from analise import classificar_acoes, classificar_fiis
+from armazenamento import PARQUET_DISPONIVEL, caminho_parquet, ler_tabela, salvar_tabela
+from cache_dados import CAMINHO_CACHE, ler_cache, obter_dados_com_cache
+from coleta_dados import obter_dados, obter_dados_em_lote, obter_dados_fii
+from metricas import ativar_perfil, cronometrar, exportar_metricas
+from publicacao import caminho_atual, publicar_versao
+
+# 🗂️ Ações e FIIs ficam em caches separados (os campos coletados são diferentes)
+CAMINHO_CACHE_FIIS = './dados/cache_fiis.sqlite'
+
+COLETORES = {
+    'acao': (obter_dados, CAMINHO_CACHE),
+    'fii': (obter_dados_fii, CAMINHO_CACHE_FIIS),
+}
+
+def ler_simbolos(caminho):
+    simbolos = pd.read_csv(caminho, dtype=str)
+    simbolos['Ticker'] = simbolos['Ticker'].str.strip().str.upper()
+    simbolos['Tipo'] = simbolos['Tipo'].str.strip().str.lower()
+    return simbolos.drop_duplicates('Ticker')
+
+def para_yahoo(ticker):
+    return ticker if ticker.endswith('.SA') else f'{ticker}.SA'
+
+# 🔄 Atualização incremental: só baixa o que está mais velho que o limite
+def coletar(tickers, tipo, idade_max, workers, forcar=False):
+    coletor, caminho = COLETORES[tipo]
+    dados, antigos = [], []
+    for ticker in tickers:
+        registro, idade = (None, None) if forcar else ler_cache(ticker, caminho)
+        if registro is not None and idade <= idade_max:
+            dados.append(registro)
+        else:
+            antigos.append(ticker)
+
+    atualizar = partial(obter_dados_com_cache, forcar_atualizacao=True, coletor=coletor, caminho=caminho)
+    novos, erros = obter_dados_em_lote(antigos, max_workers=workers, coletor=atualizar)
+    for ticker, e in erros.items():
+        # Sem dado novo: usa o último salvo, se houver
+        registro, _ = ler_cache(ticker, caminho)
+        if registro is not None:
+            dados.append(registro)
+        print(f"⚠️ Erro ao atualizar {ticker}: {e}")
+
+    print(f"   {tipo}: {len(tickers)} ativos, {len(antigos)} atualizados, {len(erros)} com erro")
+    return dados + novos
+
+def ler_anterior(nome, pasta):
+    # Base que os dashboards leem hoje (versão publicada ou dados/<tipo>.csv); None se não existir
+    caminho = caminho_atual(nome, pasta)
+    if not os.path.exists(caminho):
+        return None
+    return ler_tabela(caminho, nome)
+
+def completar_com_anterior(df, anterior):
+    # 🧩 Campos que o provedor não entrega (ex.: Vacância dos FIIs) vêm da base anterior, por Ticker
+    if anterior is None or anterior.empty:
+        return df
+    anterior = anterior.assign(Ticker=anterior['Ticker'].astype(str)).drop_duplicates('Ticker').set_index('Ticker')
+    for coluna in anterior.columns.drop('Recomendação', errors='ignore'):
+        if coluna not in df.columns or df[coluna].isna().all():
+            df[coluna] = df['Ticker'].map(anterior[coluna])
+    if 'Setor' in df.columns and 'Setor' in anterior.columns:
+        sem_setor = df['Setor'] == 'Não informado'
+        df.loc[sem_setor, 'Setor'] = df.loc[sem_setor, 'Ticker'].map(anterior['Setor'].astype(object)).fillna('Não informado')
+    return df
+
+def montar_acoes(dados, anterior=None):
+    with cronometrar('dataframe_montar_acoes'):
+        df = pd.DataFrame(dados).rename(columns={'DY (%)': 'Dividend Yield (%)'})
+    df['Ticker'] = df['Ticker'].str.replace('.SA', '', regex=False)
+    df = completar_com_anterior(df, anterior)
+    df['Recomendação'] = classificar_acoes(df, coluna_dy='Dividend Yield (%)')
+    return df.sort_values('Ticker', ignore_index=True)
+
+def montar_fiis(dados, anterior=None):
+    with cronometrar('dataframe_montar_fiis'):
+        df = pd.DataFrame(dados)
+    df['Ticker'] = df['Ticker'].str.replace('.SA', '', regex=False)
+    df = completar_com_anterior(df, anterior)
+    df['Recomendação'] = classificar_fiis(df)
+    return df.sort_values('Ticker', ignore_index=True)
+
+def publicar(df, pasta, tipo):
+    # Grava no formato que os dashboards leem (CSV + Parquet quando disponível)
+    caminho = os.path.join(pasta, f'{tipo}.csv')
+    salvar_tabela(df, caminho, tipo)
+    if PARQUET_DISPONIVEL:
+        salvar_tabela(df, caminho_parquet(caminho), tipo)
+    return caminho
+
+def coletar_universo(simbolos, idade_max=24 * 60 * 60, workers=16, forcar=False, pasta='./dados'):
+    # Coleta e classifica ações e FIIs do CSV de símbolos: {'acoes': df, 'fiis': df}
+    # A base atual em `pasta` completa os campos que o provedor não tem
+    simbolos = ler_simbolos(simbolos)
+    resultado = {}
+    for tipo, nome, montar in (('acao', 'acoes', montar_acoes), ('fii', 'fiis', montar_fiis)):
+        tickers = [para_yahoo(t) for t in simbolos.loc[simbolos['Tipo'] == tipo, 'Ticker']]
+        if not tickers:
+            continue
+        with cronometrar(f'coleta_lote_{nome}'):
+            dados = coletar(tickers, tipo, idade_max, workers, forcar)
+        if dados:
+            resultado[nome] = montar(dados, ler_anterior(nome, pasta))
+    return resultado
+
+def rodar_screener(simbolos, pasta='./dados', idade_max=24 * 60 * 60, workers=16, forcar=False):
+    resultado = coletar_universo(simbolos, idade_max, workers, forcar, pasta)
+    for nome, df in resultado.items():
+        print(f"   ✅ {publicar(df, pasta, nome)} ({len(df)} ativos)")
+    if resultado:
+        # Dashboards, carteira e alertas leem a versão publicada (publicacao.caminho_atual) quando existe:
+        # sem publicar aqui, uma rodada manual ficaria invisível depois do primeiro ciclo do atualizador
+        print(f"   📦 Versão {publicar_versao(resultado, pasta)} publicada")
+    return resultado
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Screener BG Analista — universo B3 completo")
+    parser.add_argument('--simbolos', default='./dados/ativos_b3.csv', help="CSV com colunas Ticker,Tipo (acao/fii)")
+    parser.add_argument('--pasta', default='./dados', help="pasta onde os dashboards leem acoes/fiis")
+    parser.add_argument('--idade-max-horas', type=float, default=24,
+                        help="só atualiza ativos com dados mais velhos que isso (ex.: 24 à noite, 0.5 no intradiário)")
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--tudo', action='store_true', help="ignora o cache e atualiza todos os ativos")
+    parser.add_argument('--perfil', action='store_true', help="grava um cProfile da etapa mais lenta")
+    args = parser.parse_args()
+    ativar_perfil(args.perfil)
+
+    inicio = time.time()
+    print("===== SCREENER BG ANALISTA =====")
+    rodar_screener(args.simbolos, args.pasta, args.idade_max_horas * 60 * 60, args.workers, args.tudo)
+    print(f"\nConcluído em {time.time() - inicio:.1f}s")
+    print(f"📊 Métricas: {', '.join(exportar_metricas(nome='screener'))}")
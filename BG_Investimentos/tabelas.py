@@ -0,0 +1,88 @@
+import numpy as np
+import streamlit as st
+
+# 🗂️ Índices pré-calculados por dataset: filtros viram buscas em dicionário
+COLUNAS_INDEXADAS = ('Recomendação', 'Setor')
+TAMANHOS_PAGINA = (25, 50, 100, 500)
+
+def construir_indices(df):
+    indices = {'valores': {}, 'ordem': {}}
+    for coluna in COLUNAS_INDEXADAS:
+        if coluna in df.columns:
+            grupos = df.groupby(coluna, observed=True, sort=False).indices
+            indices['valores'][coluna] = {str(valor): np.asarray(pos) for valor, pos in grupos.items()}
+    # Tickers ordenados para busca por prefixo com searchsorted
+    tickers = np.asarray(df['Ticker'].astype(str).str.upper(), dtype=str)
+    ordem = np.argsort(tickers, kind='stable')
+    indices['tickers'] = tickers[ordem]
+    indices['tickers_posicoes'] = ordem
+    return indices
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def indices_do_dataset(versao, _df):
+    # Compartilhado entre reruns e sessões; a versão vem de carregamento.py (arquivo + mtime ou hash)
+    return construir_indices(_df)
+
+def filtrar(df, indices, filtros=None, busca=''):
+    posicoes = None
+    for coluna, valores in (filtros or {}).items():
+        mapa = indices['valores'].get(coluna)
+        if mapa is None:
+            continue
+        selecionados = [mapa[str(v)] for v in valores if str(v) in mapa]
+        atuais = np.concatenate(selecionados) if selecionados else np.empty(0, dtype=np.intp)
+        posicoes = atuais if posicoes is None else np.intersect1d(posicoes, atuais, assume_unique=True)
+
+    termo = (busca or '').strip().upper()
+    if termo:
+        tickers = indices['tickers']
+        inicio = np.searchsorted(tickers, termo, side='left')
+        fim = np.searchsorted(tickers, termo + '\uffff', side='left')
+        encontrados = indices['tickers_posicoes'][inicio:fim]
+        posicoes = encontrados if posicoes is None else np.intersect1d(posicoes, encontrados)
+
+    if posicoes is None:
+        return np.arange(len(df))
+    return np.sort(posicoes)
+
+def ordenar(df, indices, posicoes, coluna=None, crescente=True):
+    if not coluna:
+        return posicoes
+    # A ordem completa da coluna é calculada uma vez e reaproveitada por todos os filtros
+    ordem = indices['ordem'].get(coluna)
+    if ordem is None:
+        serie = df[coluna]
+        chave = serie.cat.codes.to_numpy() if hasattr(serie, 'cat') else serie.to_numpy()
+        ordem = np.argsort(chave, kind='stable')
+        indices['ordem'][coluna] = ordem
+    if not crescente:
+        ordem = ordem[::-1]
+    mascara = np.zeros(len(df), dtype=bool)
+    mascara[posicoes] = True
+    return ordem[mascara[ordem]]
+
+def paginar(posicoes, pagina, tamanho):
+    inicio = (pagina - 1) * tamanho
+    return posicoes[inicio:inicio + tamanho]
+
+# 📄 Tabela paginada: filtros, busca e ordenação no servidor, só a página vai ao navegador
+def mostrar_tabela(df, chave, filtros=None):
+    indices = indices_do_dataset(df.attrs.get('versao', chave), df)
+
+    col1, col2, col3, col4 = st.columns([3, 3, 1, 1])
+    busca = col1.text_input("🔎 Buscar ticker", key=f'{chave}_busca')
+    coluna = col2.selectbox("Ordenar por", [''] + list(df.columns), key=f'{chave}_ordem')
+    crescente = col3.toggle("Crescente", value=True, key=f'{chave}_crescente')
+    tamanho = col4.selectbox("Linhas", TAMANHOS_PAGINA, index=1, key=f'{chave}_tamanho')
+
+    posicoes = ordenar(df, indices, filtrar(df, indices, filtros, busca), coluna, crescente)
+    total_paginas = max(1, -(-len(posicoes) // tamanho))
+    pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1, key=f'{chave}_pagina')
+    pagina = min(pagina, total_paginas)
+
+    visiveis = paginar(posicoes, pagina, tamanho)
+    st.dataframe(df.iloc[visiveis], use_container_width=True, hide_index=True)
+    inicio = (pagina - 1) * tamanho
+    st.caption(f"Mostrando {inicio + len(visiveis) if len(posicoes) else 0} de {len(posicoes)} "
+               f"(página {pagina} de {total_paginas})")
+    return posicoes
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from alertas import MotorAlertas
+
+# 🧪 Motor de alertas: cruzamento de limite, 'mudou' e lotes parciais (colunas ausentes não zeram o estado)
+
+REGRAS = [
+    {'id': 'upside', 'ticker': 'ITSA4', 'metrica': 'Upside (%)', 'operador': '>', 'valor': 10},
+    {'id': 'recomendacao', 'ticker': 'ITSA4.SA', 'metrica': 'Recomendação', 'operador': 'mudou', 'valor': None},
+    {'id': 'pvp', 'ticker': 'HGLG11', 'metrica': 'P/VP', 'operador': '<', 'valor': 0.95},
+]
+
+def _motor():
+    return MotorAlertas(REGRAS, saidas=[])
+
+def _lote(**colunas):
+    return pd.DataFrame(colunas)
+
+def test_limite_dispara_so_ao_cruzar():
+    motor = _motor()
+    assert motor.atualizar(_lote(Ticker=['ITSA4'], **{'Upside (%)': [5.0]})) == []
+    alertas = motor.atualizar(_lote(Ticker=['ITSA4'], **{'Upside (%)': [12.0]}))
+    assert [a['regra'] for a in alertas] == ['upside']
+    assert alertas[0]['valor'] == 12.0
+    # Continua acima do limite: não repete
+    assert motor.atualizar(_lote(Ticker=['ITSA4'], **{'Upside (%)': [15.0]})) == []
+    # Volta para baixo e cruza de novo
+    assert motor.atualizar(_lote(Ticker=['ITSA4'], **{'Upside (%)': [8.0]})) == []
+    assert [a['regra'] for a in motor.atualizar(_lote(Ticker=['ITSA4'], **{'Upside (%)': [11.0]}))] == ['upside']
+
+def test_limite_no_dtype_do_dataset():
+    motor = _motor()
+    # 0.95 em float32 não pode ser lido como "< 0.95"
+    assert motor.atualizar(_lote(Ticker=['HGLG11'], **{'P/VP': pd.array([0.95], dtype='float32')})) == []
+    assert [a['regra'] for a in motor.atualizar(_lote(Ticker=['HGLG11'], **{'P/VP': [0.9]}))] == ['pvp']
+
+def test_mudou_de_recomendacao():
+    motor = _motor()
+    # Primeira leitura só registra o valor
+    assert motor.atualizar(_lote(Ticker=['ITSA4.SA'], Recomendação=['Comprar'])) == []
+    assert motor.atualizar(_lote(Ticker=['ITSA4.SA'], Recomendação=['Comprar'])) == []
+    alertas = motor.atualizar(_lote(Ticker=['ITSA4.SA'], Recomendação=['Vender']))
+    assert [(a['regra'], a['anterior'], a['valor']) for a in alertas] == [('recomendacao', 'Comprar', 'Vender')]
+
+def test_lote_parcial_mantem_o_valor_anterior():
+    motor = _motor()
+    motor.atualizar(_lote(Ticker=['ITSA4'], Recomendação=['Comprar'], **{'Upside (%)': [5.0]}))
+    # Lote sem a coluna Recomendação: a regra 'mudou' não é avaliada e o estado não vira NaN
+    assert motor.atualizar(_lote(Ticker=['ITSA4'], **{'Upside (%)': [6.0]})) == []
+    assert motor.dados.loc['ITSA4', 'Recomendação'] == 0
+    assert motor.dados.loc['ITSA4', 'Upside (%)'] == 6.0
+    alertas = motor.atualizar(_lote(Ticker=['ITSA4'], Recomendação=['Vender']))
+    assert [(a['regra'], a['anterior'], a['valor']) for a in alertas] == [('recomendacao', 'Comprar', 'Vender')]
+    # A regra de Upside não veio no lote: continua sem disparar e com o último valor
+    assert motor.dados.loc['ITSA4', 'Upside (%)'] == 6.0
+
+def test_lote_parcial_so_avalia_regras_da_metrica_presente():
+    motor = _motor()
+    motor.atualizar(_lote(Ticker=['ITSA4', 'HGLG11'], Recomendação=['Manter', None],
+                          **{'Upside (%)': [12.0, None], 'P/VP': [None, 1.1]}), alertar=False)
+    alertas = motor.atualizar(_lote(Ticker=['HGLG11', 'ITSA4'], **{'P/VP': [0.9, None]}))
+    assert [a['regra'] for a in alertas] == ['pvp']
+    assert motor.dados.loc['ITSA4', 'Upside (%)'] == 12.0
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from backtest import montar_matrizes, classificar_matriz, rodar_backtest, varrer_parametros
+
+# 🧪 Backtest: fundamentos "as-of", sem sinal antes do primeiro snapshot e retorno futuro por balde
+
+def _dados():
+    datas = pd.bdate_range('2024-01-01', periods=40)
+    precos = pd.DataFrame({
+        'SOBE3': 10 * 1.01 ** np.arange(40),
+        'CAI3': 10 * 0.99 ** np.arange(40),
+    }, index=datas)
+    fundamentos = pd.DataFrame({
+        'Data': [datas[5], datas[5]],
+        'Ticker': ['SOBE3', 'CAI3'],
+        'Upside (%)': [30.0, -20.0],
+        'Dividend Yield (%)': [8.0, 8.0],
+        'ROE (%)': [20.0, 20.0],
+    })
+    return fundamentos, precos
+
+def test_sinal_so_depois_do_primeiro_snapshot():
+    fundamentos, precos = _dados()
+    matrizes, precos = montar_matrizes(fundamentos, precos, 'acoes')
+    sinais = classificar_matriz(matrizes, 'acoes')
+    assert (sinais[:5] == -1).all()
+    assert (sinais[5:, list(precos.columns).index('SOBE3')] == 0).all()
+    assert (sinais[5:, list(precos.columns).index('CAI3')] == 2).all()
+
+def test_retornos_por_recomendacao():
+    fundamentos, precos = _dados()
+    resultado = rodar_backtest(fundamentos, precos, horizontes=(5,)).set_index('Recomendação')
+    assert resultado.loc['Comprar', 'Observações'] == 40 - 5 - 5
+    assert resultado.loc['Comprar', 'Retorno Médio (%)'] > 0
+    assert resultado.loc['Vender', 'Retorno Médio (%)'] < 0
+    assert resultado.loc['Comprar', 'Acerto (%)'] == 100.0
+    assert resultado.loc['Manter', 'Observações'] == 0
+    spread = resultado.loc['Comprar − Vender', 'Retorno Médio (%)']
+    assert spread == round(resultado.loc['Comprar', 'Retorno Médio (%)'] - resultado.loc['Vender', 'Retorno Médio (%)'], 3)
+
+def test_varredura_reclassifica_por_cenario():
+    fundamentos, precos = _dados()
+    cenarios = [{'nome': 'base'}, {'nome': 'exigente', 'acoes': {'upside_min_compra': 50}}]
+    resultado = varrer_parametros(fundamentos, precos, cenarios, horizontes=(5,))
+    comprar = resultado[resultado['Recomendação'] == 'Comprar'].set_index('Cenário')['Observações']
+    assert comprar['base'] == 30
+    assert comprar['exigente'] == 0
@@ -0,0 +1,45 @@
+import cache_dados
+from cache_dados import aguardar_revalidacoes, ler_cache, obter_dados_com_cache, salvar_cache
+
+# 🧪 Cache de fundamentos: TTL, stale-while-revalidate e limite de entradas
+
+class Coletor:
+    def __init__(self):
+        self.chamadas = 0
+
+    def __call__(self, ticker):
+        self.chamadas += 1
+        return {'Ticker': ticker, 'versao': self.chamadas}
+
+def test_dentro_do_ttl_nao_coleta(tmp_path):
+    caminho = str(tmp_path / 'cache.sqlite')
+    coletor = Coletor()
+    assert obter_dados_com_cache('A', coletor=coletor, caminho=caminho)['versao'] == 1
+    assert obter_dados_com_cache('A', coletor=coletor, caminho=caminho)['versao'] == 1
+    assert coletor.chamadas == 1
+
+def test_obsoleto_devolve_o_antigo_e_revalida(tmp_path):
+    caminho = str(tmp_path / 'cache.sqlite')
+    coletor = Coletor()
+    obter_dados_com_cache('A', coletor=coletor, caminho=caminho)
+    # ttl negativo: o registro já passou do TTL, mas está dentro da janela obsoleta
+    assert obter_dados_com_cache('A', ttl=-1, coletor=coletor, caminho=caminho)['versao'] == 1
+    aguardar_revalidacoes()
+    assert coletor.chamadas == 2
+    assert ler_cache('A', caminho)[0]['versao'] == 2
+
+def test_alem_da_janela_coleta_na_hora(tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'cache.sqlite')
+    coletor = Coletor()
+    obter_dados_com_cache('A', coletor=coletor, caminho=caminho)
+    monkeypatch.setattr(cache_dados, 'JANELA_OBSOLETA', 0)
+    assert obter_dados_com_cache('A', ttl=-1, coletor=coletor, caminho=caminho)['versao'] == 2
+
+def test_forcar_atualizacao_e_limite_de_entradas(tmp_path):
+    caminho = str(tmp_path / 'cache.sqlite')
+    coletor = Coletor()
+    obter_dados_com_cache('A', coletor=coletor, caminho=caminho)
+    assert obter_dados_com_cache('A', forcar_atualizacao=True, coletor=coletor, caminho=caminho)['versao'] == 2
+    for ticker in 'BCD':
+        salvar_cache(ticker, {'Ticker': ticker}, caminho, max_entradas=2)
+    assert [ler_cache(t, caminho)[0] is not None for t in 'ABCD'] == [False, False, True, True]
@@ -0,0 +1,59 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from armazenamento import salvar_tabela
+from carregamento import carregar_arquivo
+
+# 🧪 Sessões simultâneas: todas leem o mesmo DataFrame do processo, sem cópia por sessão
+
+def _dataset(pasta, n=200_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Ticker': [f'ACAO{i}' for i in range(n)],
+        'Upside (%)': rng.normal(5, 15, n),
+        'Dividend Yield (%)': rng.uniform(0, 12, n),
+        'ROE (%)': rng.uniform(-5, 30, n),
+        'Preço Atual': rng.uniform(1, 100, n),
+    })
+    caminho = str(pasta / 'acoes.parquet')
+    salvar_tabela(df, caminho, 'acoes')
+    return caminho
+
+def _abrir(caminho, sessoes):
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        abertas = [carregar_arquivo(caminho, 'acoes') for _ in range(sessoes)]
+        return abertas, tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+
+def test_sessoes_compartilham_os_dados(tmp_path):
+    caminho = _dataset(tmp_path)
+    primeira = carregar_arquivo(caminho, 'acoes')
+    abertas, _ = _abrir(caminho, 50)
+    for df in abertas:
+        assert df is not primeira
+        for coluna in ('Upside (%)', 'Dividend Yield (%)', 'Preço Atual'):
+            assert np.shares_memory(df[coluna].to_numpy(), primeira[coluna].to_numpy())
+        assert np.shares_memory(df['Recomendação'].array.codes, primeira['Recomendação'].array.codes)
+
+def test_memoria_nao_cresce_com_as_sessoes(tmp_path):
+    caminho = _dataset(tmp_path)
+    tamanho = carregar_arquivo(caminho, 'acoes').memory_usage(deep=True).sum()  # aquece o cache
+    _, uma = _abrir(caminho, 1)
+    _, cinquenta = _abrir(caminho, 50)
+    # Uma cópia por sessão custaria o dataset inteiro a cada sessão; a visão rasa só custa os objetos
+    # do DataFrame (alguns KB), então 50 sessões juntas ficam abaixo de 1/10 de uma única cópia
+    assert uma < tamanho / 100
+    assert cinquenta < tamanho / 10
+
+def test_alteracao_numa_sessao_nao_vaza(tmp_path):
+    caminho = _dataset(tmp_path)
+    uma, outra = carregar_arquivo(caminho, 'acoes'), carregar_arquivo(caminho, 'acoes')
+    original = outra['Upside (%)'].iloc[0]
+    uma.loc[0, 'Upside (%)'] = 999.0
+    assert outra['Upside (%)'].iloc[0] == original
+    assert carregar_arquivo(caminho, 'acoes')['Upside (%)'].iloc[0] == original
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from carteira import avaliar_carteiras, montar_mercado, rebalancear
+
+# 🧪 Regras da carteira: 'Vender' nunca é comprado, 'Comprar' nunca é vendido, o caixa não fica
+# negativo e cotação zerada, vazia ou ausente conta como "Sem Cotação"
+
+def _mercado(precos, recomendacoes):
+    acoes = pd.DataFrame({
+        'Ticker': list(precos),
+        'Preço Atual': list(precos.values()),
+        'Dividend Yield (%)': 5.0,
+        'Recomendação': [recomendacoes[t] for t in precos],
+    })
+    fiis = pd.DataFrame(columns=['Ticker', 'Preço Atual', 'Dividend Yield (%)', 'Renda Mensal (R$)', 'Recomendação'])
+    return montar_mercado(acoes, fiis)
+
+def _posicoes(linhas):
+    return pd.DataFrame(linhas, columns=['Carteira', 'Ticker', 'Quantidade', 'Preço Médio'])
+
+def _caixa(ordens):
+    sinal = np.where(ordens['Ordem'] == 'Vender', 1.0, -1.0)
+    return (ordens['Valor (R$)'] * sinal).groupby(ordens['Carteira']).sum()
+
+def _conferir(ordens, posicoes, aporte):
+    compras = ordens[ordens['Ordem'] == 'Comprar']
+    vendas = ordens[ordens['Ordem'] == 'Vender']
+    assert (compras['Recomendação'] != 'Vender').all()
+    assert (vendas['Recomendação'] != 'Comprar').all()
+    assert (_caixa(ordens) + aporte >= -1e-6).all()
+    # Nunca vende mais do que a posição
+    tem = posicoes.set_index(['Carteira', 'Ticker'])['Quantidade']
+    vendidas = vendas.set_index(['Carteira', 'Ticker'])['Quantidade']
+    assert (vendidas <= tem.reindex(vendidas.index)).all()
+
+def test_sinais_respeitados_mesmo_contra_o_peso_alvo():
+    mercado = _mercado({'AAAA3': 10.0, 'BBBB3': 20.0, 'CCCC3': 5.0},
+                       {'AAAA3': 'Comprar', 'BBBB3': 'Vender', 'CCCC3': 'Manter'})
+    posicoes = _posicoes([
+        ('p', 'AAAA3', 100, 8.0),
+        ('p', 'BBBB3', 10, 25.0),
+        ('p', 'CCCC3', 40, 5.0),
+    ])
+    # Alvo pede vender o 'Comprar' e comprar o 'Vender': nenhuma das duas ordens pode sair
+    ordens = rebalancear(posicoes, mercado, alvos={'AAAA3': 0, 'BBBB3': 80, 'CCCC3': 20})
+    _conferir(ordens, posicoes, 0.0)
+    assert not ((ordens['Ticker'] == 'AAAA3') & (ordens['Ordem'] == 'Vender')).any()
+    assert not ((ordens['Ticker'] == 'BBBB3') & (ordens['Ordem'] == 'Comprar')).any()
+
+def test_sem_alvo_zera_o_vender_e_compra_com_o_caixa():
+    mercado = _mercado({'AAAA3': 10.0, 'BBBB3': 20.0}, {'AAAA3': 'Comprar', 'BBBB3': 'Vender'})
+    posicoes = _posicoes([('p', 'AAAA3', 10, 10.0), ('p', 'BBBB3', 10, 20.0)])
+    ordens = rebalancear(posicoes, mercado).set_index('Ticker')
+    assert ordens.loc['BBBB3', 'Ordem'] == 'Vender' and ordens.loc['BBBB3', 'Quantidade'] == 10
+    assert ordens.loc['AAAA3', 'Ordem'] == 'Comprar' and ordens.loc['AAAA3', 'Quantidade'] == 20
+
+def test_caixa_nunca_negativo_em_carteiras_aleatorias():
+    rng = np.random.default_rng(7)
+    tickers = [f'T{i:03d}3' for i in range(30)]
+    precos = dict(zip(tickers, np.round(rng.uniform(1, 100, len(tickers)), 2)))
+    recomendacoes = dict(zip(tickers, rng.choice(['Comprar', 'Manter', 'Vender'], len(tickers))))
+    mercado = _mercado(precos, recomendacoes)
+    linhas = [(f'c{c}', t, int(rng.integers(0, 300)), 10.0)
+              for c in range(50) for t in rng.choice(tickers, 8, replace=False)]
+    posicoes = _posicoes(linhas)
+    alvos = dict(zip(tickers, rng.uniform(0, 10, len(tickers))))
+    for aporte, alvo in ((0.0, None), (1000.0, None), (0.0, alvos), (250.0, alvos)):
+        ordens = rebalancear(posicoes, mercado, aporte=aporte, alvos=alvo)
+        assert len(ordens)
+        _conferir(ordens, posicoes, aporte)
+
+@pytest.mark.parametrize('preco', [0.0, np.nan])
+def test_cotacao_zerada_ou_vazia_conta_como_sem_cotacao(preco):
+    mercado = _mercado({'AAAA3': 10.0, 'ZERO3': preco}, {'AAAA3': 'Comprar', 'ZERO3': 'Comprar'})
+    posicoes = _posicoes([
+        ('p', 'AAAA3', 10, 8.0),
+        ('p', 'ZERO3', 10, 8.0),
+        ('p', 'FORA3', 10, 8.0),
+    ])
+    detalhes, resumo = avaliar_carteiras(posicoes, mercado)
+    assert resumo['Sem Cotação'].tolist() == [2]
+    assert resumo['Valor (R$)'].tolist() == [100.0]
+    assert detalhes['Valor (R$)'].isna().tolist() == [False, True, True]
+    # E não geram ordens (nem entram no peso alvo)
+    ordens = rebalancear(posicoes, mercado, aporte=100.0)
+    assert ordens['Ticker'].tolist() == ['AAAA3']
+
+def test_fii_sem_preco_usa_o_preco_implicito():
+    acoes = pd.DataFrame(columns=['Ticker', 'Preço Atual', 'Dividend Yield (%)', 'Recomendação'])
+    fiis = pd.DataFrame({
+        'Ticker': ['HGLG11', 'XPLG11'],
+        'Preço Atual': [0.0, 0.0],
+        'Dividend Yield (%)': [12.0, np.nan],
+        'Renda Mensal (R$)': [1.0, 1.0],
+        'Recomendação': ['Manter', 'Manter'],
+    })
+    mercado = montar_mercado(acoes, fiis)
+    _, resumo = avaliar_carteiras(_posicoes([('p', 'HGLG11', 1, 90.0), ('p', 'XPLG11', 1, 90.0)]), mercado)
+    assert resumo['Valor (R$)'].tolist() == [100.0]
+    assert resumo['Sem Cotação'].tolist() == [1]
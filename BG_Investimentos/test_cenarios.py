@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from cenarios import ler_cenarios, resumir, rodar_cenarios
+
+# 🧪 Lote de cenários: rótulos únicos por arquivo e por cenário
+
+def _acoes(pasta, upside):
+    pasta.mkdir()
+    caminho = pasta / 'acoes.csv'
+    caminho.write_text(
+        'Ticker,Upside (%),Dividend Yield (%),ROE (%)\n'
+        f'ITSA4,{upside},8,18\nWEGE3,-10,3,23\n', encoding='utf-8')
+    return str(caminho)
+
+def test_mesmo_nome_de_arquivo_em_pastas_diferentes(tmp_path):
+    arquivos = [_acoes(tmp_path / 'jan', 15), _acoes(tmp_path / 'fev', 5)]
+    cenarios = [{'nome': 'base'}, {'nome': 'exigente', 'acoes': {'upside_min_compra': 20}}]
+    resultado = rodar_cenarios(arquivos, cenarios, workers=1)
+    assert list(resultado['Arquivo'].cat.categories) == ['jan/acoes.csv', 'fev/acoes.csv']
+    assert len(resultado) == 2 * 2 * 2
+    contagem = resumir(resultado).set_index(['Arquivo', 'Cenário'])['Comprar']
+    assert contagem[('jan/acoes.csv', 'base')] == 1
+    assert contagem[('jan/acoes.csv', 'exigente')] == 0
+    assert contagem[('fev/acoes.csv', 'base')] == 0
+
+def test_nomes_de_cenario_repetidos(tmp_path):
+    caminho = tmp_path / 'cenarios.json'
+    caminho.write_text(json.dumps([{'nome': 'a'}, {'nome': 'a', 'acoes': {'dy_min_compra': 8}}]), encoding='utf-8')
+    with pytest.raises(ValueError, match='repetidos'):
+        ler_cenarios(str(caminho))
+    with pytest.raises(ValueError, match='repetidos'):
+        rodar_cenarios([_acoes(tmp_path / 'x', 1)], [{'nome': 'a'}, {'nome': 'a'}], workers=1)
@@ -0,0 +1,37 @@
+import pytest
+
+from governador import CircuitoAberto, Governador
+
+# 🧪 Disjuntor com relógio falso: 429 na chamada de teste (meio-aberto) não pode travar o circuito
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+def falha_rede():
+    raise OSError('conexão recusada')
+
+def limite_taxa():
+    raise RuntimeError('429 Too Many Requests')
+
+def test_429_na_chamada_de_teste_libera_o_disjuntor():
+    relogio = Relogio()
+    gov = Governador(tentativas=1, limite_falhas=2, recuperacao=30.0,
+                     dormir=lambda s: None, relogio=relogio)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            gov.executar(falha_rede)
+    with pytest.raises(CircuitoAberto):
+        gov.executar(lambda: 'ok')
+
+    relogio.agora += 31
+    with pytest.raises(RuntimeError):
+        gov.executar(limite_taxa)  # chamada de teste recebe 429
+    assert not gov.disjuntor.testando
+
+    relogio.agora += 60  # balde de fichas reabastecido
+    assert gov.executar(lambda: 'ok') == 'ok'
+    assert gov.disjuntor.aberto_em is None
@@ -0,0 +1,72 @@
+import io
+
+import numpy as np
+import pytest
+
+import ingestao
+from ingestao import ErroCabecalho, converter_numeros, ler_csv
+
+# 🧪 Ingestão de CSV: cabeçalho, números brasileiros e quarentena com motivo e linha
+
+CABECALHO_FIIS = 'Ticker;Setor;P/VP;Dividend Yield (%);Vacância (%)\n'
+
+def _arquivo(texto, codificacao='utf-8'):
+    return io.BytesIO(texto.encode(codificacao))
+
+def test_numeros_no_formato_brasileiro():
+    import pandas as pd
+    numeros, invalidos = converter_numeros(pd.Series(['1.234,56', '8,2%', 'R$ 9,50', '', 'abc', '0.95']))
+    np.testing.assert_allclose(numeros[[0, 1, 2, 5]], [1234.56, 8.2, 9.5, 0.95])
+    assert np.isnan(numeros[3]) and np.isnan(numeros[4])
+    assert invalidos.tolist() == [False, False, False, False, True, False]
+
+def test_quarentena_com_motivo_e_linha():
+    texto = CABECALHO_FIIS + (
+        'hglg11;Logístico;0,95;9,2;2,1\n'
+        ';Papel;1;11;0\n'
+        'xplg11;Logístico;abc;9;1\n'
+        'mxrf11;Papel;1,01;11,5;0;sobra\n'
+        'knri11;Híbrido;1;8;3\n'
+    )
+    df, quarentena, resumo = ler_csv(_arquivo(texto), 'fiis', tamanho_bloco=2)
+    assert df['Ticker'].astype(str).tolist() == ['HGLG11', 'KNRI11']
+    assert df['P/VP'].dtype == np.float32
+    assert quarentena['Linha'].tolist() == [3, 4, 5]
+    assert quarentena['Motivo'].tolist() == [
+        'Ticker vazio', 'Valor não numérico em P/VP', 'Mais campos que o cabeçalho']
+    assert resumo == {'linhas': 5, 'validas': 2, 'quarentena': 3, 'separador': ';'}
+
+def test_cabecalho_com_espacos_sinonimo_e_latin1():
+    texto = 'Ticker , DY (%) ,Upside (%),ROE (%),Ignorada\nITSA4,"8,2",15,18,x\n'
+    df, quarentena, _ = ler_csv(_arquivo(texto, 'latin-1'), 'acoes')
+    assert list(df.columns) == ['Ticker', 'Dividend Yield (%)', 'Upside (%)', 'ROE (%)']
+    assert df['Dividend Yield (%)'].iloc[0] == pytest.approx(8.2)
+    assert quarentena.empty
+
+def test_cabecalho_invalido_nao_fecha_o_arquivo():
+    arquivo = _arquivo('Ticker;P/VP\nHGLG11;1\n')
+    with pytest.raises(ErroCabecalho, match='Vacância'):
+        ler_csv(arquivo, 'fiis')
+    assert not arquivo.closed
+    with pytest.raises(ErroCabecalho):
+        ler_csv(_arquivo(''), 'fiis')
+
+def test_utf8_com_acento_cortado_na_amostra():
+    linhas = 'hglg11;Logístico;0,95;9,2;2,1\n' * 3000
+    # Espaços no cabeçalho deslocam as linhas até um 'í' (2 bytes) ficar dividido no fim da amostra de 64 KB
+    for espacos in range(40):
+        dados = (CABECALHO_FIIS.replace('\n', ' ' * espacos + '\n') + linhas).encode('utf-8')
+        if dados[64 * 1024 - 1:64 * 1024 + 1] == 'í'.encode('utf-8'):
+            break
+    else:
+        pytest.fail('nenhum deslocamento divide o acento na borda da amostra')
+    df, quarentena, _ = ler_csv(io.BytesIO(dados), 'fiis')
+    assert df['Setor'].astype(str).unique().tolist() == ['Logístico']
+    assert quarentena.empty
+
+def test_quarentena_limitada_por_linhas(monkeypatch):
+    monkeypatch.setattr(ingestao, 'MAX_QUARENTENA', 25)
+    texto = CABECALHO_FIIS + 'x;Papel;abc;1;1\n' * 100
+    _, quarentena, resumo = ler_csv(_arquivo(texto), 'fiis', tamanho_bloco=10)
+    assert len(quarentena) == 25
+    assert resumo['quarentena'] == 100
@@ -0,0 +1,54 @@
+import json
+import math
+
+import pytest
+
+from coleta_dados import obter_cotacao, obter_dados, obter_dados_fii
+from provedores import ProvedorFixture, definir_provedor
+
+# 🧪 Caminho offline: coleta via provedor 'fixture' (snapshot JSON), sem rede e sem yfinance
+
+SNAPSHOT = {
+    'ITSA4.SA': {
+        'currentPrice': 10.0, 'trailingPE': 8.0, 'dividendYield': 0.08, 'returnOnEquity': 0.2,
+        'profitMargins': 0.3, 'trailingEps': 1.25, 'bookValue': 6.0, 'dividendRate': 0.8,
+        'freeCashflow': None, 'sharesOutstanding': None,
+    },
+    'HGLG11.SA': {'currentPrice': None, 'priceToBook': 0.95, 'dividendYield': 0.092,
+                  'dividendRate': 14.4, 'industry': 'Logístico'},
+}
+
+@pytest.fixture
+def provedor(tmp_path):
+    caminho = tmp_path / 'snapshot.json'
+    caminho.write_text(json.dumps(SNAPSHOT), encoding='utf-8')
+    provedor = ProvedorFixture(str(caminho))
+    definir_provedor(provedor)
+    yield provedor
+    definir_provedor(None)
+
+def test_acao_pelo_snapshot(provedor):
+    dados = obter_dados('ITSA4.SA')
+    assert dados['Preço Atual'] == 10.0
+    assert dados['DY (%)'] == 8.0
+    assert dados['ROE (%)'] == 20.0
+    assert dados['Margem Líquida (%)'] == 30.0
+    assert dados['Preço Justo'] > 0
+    assert dados['Upside (%)'] == pytest.approx((dados['Preço Justo'] - 10) / 10 * 100, abs=0.01)
+
+def test_fii_sem_cotacao_fica_nan(provedor):
+    dados = obter_dados_fii('HGLG11.SA')
+    assert math.isnan(dados['Preço Atual'])
+    assert dados['Setor'] == 'Logístico'
+    assert dados['Renda Mensal (R$)'] == 1.2
+    assert math.isnan(dados['Vacância (%)'])
+
+def test_cotacao_e_ticker_ausente(provedor):
+    assert obter_cotacao('ITSA4.SA') == 10.0
+    with pytest.raises(KeyError):
+        obter_dados('XXXX3.SA')
+
+def test_provedor_explicito_tem_prioridade(provedor, tmp_path):
+    outro = tmp_path / 'outro.json'
+    outro.write_text(json.dumps({'ITSA4.SA': {**SNAPSHOT['ITSA4.SA'], 'currentPrice': 20.0}}), encoding='utf-8')
+    assert obter_dados('ITSA4.SA', ProvedorFixture(str(outro)))['Preço Atual'] == 20.0
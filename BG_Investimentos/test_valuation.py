@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuation import calcular_valor_justo, dcf, gordon, graham, simular_valor_justo, valor_justo
+
+# 🧪 Preço justo: fórmulas, mediana dos métodos disponíveis e Monte Carlo reprodutível
+
+def test_formulas():
+    assert graham(2.0, 10.0) == pytest.approx(math.sqrt(22.5 * 2 * 10))
+    assert np.isnan(graham(-1.0, 10.0))
+    assert gordon(1.0, 0.12, 0.03) == pytest.approx(1.03 / 0.09)
+    assert np.isnan(gordon(1.0, 0.03, 0.05))
+    anos = np.arange(1, 11)
+    esperado = (1.05 ** anos / 1.12 ** anos).sum() + 1.05 ** 10 * 1.03 / 0.09 / 1.12 ** 10
+    assert dcf(1.0, 0.12, 0.05, 0.03, 10) == pytest.approx(esperado)
+
+def test_mediana_ignora_metodos_sem_valor():
+    justo, metodos = valor_justo([2.0, 2.0, -1.0], [10.0, 10.0, 5.0], [1.0, np.nan, np.nan], [1.0, np.nan, np.nan])
+    assert justo[0] == pytest.approx(np.median(metodos[:, 0]))
+    assert justo[1] == pytest.approx(metodos[0, 1])  # só Graham disponível
+    assert np.isnan(justo[2])
+
+def test_upside_sem_preco_fica_nan():
+    df = pd.DataFrame({
+        'Ticker': ['A', 'B'], 'Preço Atual': [10.0, 0.0], 'LPA': [1.0, 1.0], 'VPA': [8.0, 8.0],
+        'Dividendo por Ação': [0.5, 0.5], 'FCF por Ação': [np.nan, np.nan],
+    })
+    resultado = calcular_valor_justo(df)
+    a = resultado.iloc[0]
+    assert a['Upside (%)'] == pytest.approx((a['Preço Justo'] - 10) / 10 * 100, abs=0.1)
+    assert np.isnan(resultado['Upside (%)'].iloc[1])
+
+def test_monte_carlo_reprodutivel_e_ordenado():
+    df = pd.DataFrame({
+        'Ticker': ['A', 'B'], 'Preço Atual': [10.0, 50.0], 'LPA': [1.0, 2.0], 'VPA': [8.0, 12.0],
+        'Dividendo por Ação': [0.5, 1.0], 'FCF por Ação': [1.2, np.nan],
+    })
+    um = simular_valor_justo(df, 2000, semente=7, bloco=1)
+    dois = simular_valor_justo(df, 2000, semente=7)
+    pd.testing.assert_frame_equal(um, dois)
+    assert (um['Preço Justo P5'] <= um['Preço Justo P50']).all()
+    assert (um['Preço Justo P50'] <= um['Preço Justo P95']).all()
+    assert um['Prob. Acima do Preço (%)'].between(0, 100).all()
@@ -0,0 +1,146 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# 💎 Preço justo: Graham, Gordon (desconto de dividendos) e DCF simples.
+# Todas as funções recebem arrays (ou escalares) e calculam o universo inteiro de uma vez.
+
+PREMISSAS = {
+    'desconto': 0.12,           # taxa de desconto anual (k)
+    'crescimento': 0.05,        # crescimento nos anos explícitos (g)
+    'crescimento_perpetuo': 0.03,
+    'anos': 10,
+    'desvio_desconto': 0.02,    # desvios usados no Monte Carlo
+    'desvio_crescimento': 0.02,
+}
+
+def _arr(valores):
+    return np.asarray(valores, dtype='float64')
+
+def graham(lpa, vpa):
+    lpa, vpa = _arr(lpa), _arr(vpa)
+    with np.errstate(invalid='ignore'):
+        return np.where((lpa > 0) & (vpa > 0), np.sqrt(22.5 * lpa * vpa), np.nan)
+
+def gordon(dividendo, desconto, crescimento):
+    dividendo, k, g = _arr(dividendo), _arr(desconto), _arr(crescimento)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((dividendo > 0) & (k > g), dividendo * (1 + g) / (k - g), np.nan)
+
+def dcf(fluxo, desconto, crescimento, crescimento_perpetuo, anos):
+    # Soma geométrica dos fluxos explícitos + valor terminal (Gordon) trazido a valor presente
+    fluxo, k, g, gp = _arr(fluxo), _arr(desconto), _arr(crescimento), _arr(crescimento_perpetuo)
+    q = (1 + g) / (1 + k)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        soma = np.where(np.isclose(q, 1), fluxo * anos, fluxo * q * (1 - q ** anos) / (1 - q))
+        terminal = fluxo * (1 + g) ** anos * (1 + gp) / (k - gp) / (1 + k) ** anos
+        return np.where((fluxo > 0) & (k > gp), soma + terminal, np.nan)
+
+def _mediana_metodos(metodos):
+    # Mediana dos métodos disponíveis no eixo 0, sem np.nanmedian (lento e com avisos)
+    ordenado = np.sort(metodos, axis=0)  # NaN vai para o fim
+    n = (~np.isnan(metodos)).sum(axis=0)
+    media_dos_dois = (ordenado[0] + ordenado[1]) / 2
+    return np.select([n == 3, n == 2, n == 1], [ordenado[1], media_dos_dois, ordenado[0]], np.nan)
+
+def valor_justo(lpa, vpa, dividendo, fluxo, premissas=None):
+    p = {**PREMISSAS, **(premissas or {})}
+    metodos = np.stack(np.broadcast_arrays(
+        graham(lpa, vpa),
+        gordon(dividendo, p['desconto'], p['crescimento_perpetuo']),
+        dcf(fluxo, p['desconto'], p['crescimento'], p['crescimento_perpetuo'], p['anos']),
+    ))
+    return _mediana_metodos(metodos), metodos
+
+# Colunas de entrada (ver coleta_dados.obter_dados)
+COLUNAS_NECESSARIAS = ('Ticker', 'Preço Atual', 'LPA', 'VPA', 'Dividendo por Ação', 'FCF por Ação')
+
+def calcular_valor_justo(df, premissas=None):
+    # Espera as colunas LPA, VPA, Dividendo por Ação e FCF por Ação (ver coleta_dados.obter_dados)
+    fluxo = df['FCF por Ação'].where(df['FCF por Ação'] > 0, df['LPA'])
+    justo, (v_graham, v_gordon, v_dcf) = valor_justo(df['LPA'], df['VPA'], df['Dividendo por Ação'], fluxo, premissas)
+    preco = _arr(df['Preço Atual'])
+    resultado = df.copy()
+    resultado['Graham'] = v_graham.round(2)
+    resultado['Gordon'] = v_gordon.round(2)
+    resultado['DCF'] = v_dcf.round(2)
+    resultado['Preço Justo'] = justo.round(2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resultado['Upside (%)'] = np.where(preco > 0, (justo - preco) / preco * 100, np.nan).round(2)
+    return resultado
+
+def _percentis(ordenado, validos, quantis):
+    # Percentis com interpolação linear sobre linhas já ordenadas (NaN no fim de cada linha)
+    posicao = np.maximum(validos - 1, 0)[:, None] * np.asarray(quantis)[None, :]
+    baixo = np.floor(posicao).astype('int64')
+    alto = np.minimum(baixo + 1, np.maximum(validos - 1, 0)[:, None])
+    peso = (posicao - baixo).astype(ordenado.dtype)
+    v_baixo = np.take_along_axis(ordenado, baixo, axis=1)
+    v_alto = np.take_along_axis(ordenado, alto, axis=1)
+    return np.where(validos[:, None] > 0, v_baixo + (v_alto - v_baixo) * peso, np.nan)
+
+# 🎲 Monte Carlo: sorteia crescimento e desconto por simulação e recalcula Gordon + DCF
+def simular_valor_justo(df, simulacoes=10_000, premissas=None, semente=None, bloco=256):
+    p = {**PREMISSAS, **(premissas or {})}
+    rng = np.random.default_rng(semente)
+    k = rng.normal(p['desconto'], p['desvio_desconto'], simulacoes).astype('float32')
+    g = rng.normal(p['crescimento'], p['desvio_crescimento'], simulacoes).astype('float32')
+    gp = np.float32(p['crescimento_perpetuo'])
+    k = np.maximum(k, gp + np.float32(0.01))  # desconto sempre acima do crescimento perpétuo
+
+    lpa = _arr(df['LPA'])
+    fcf = _arr(df['FCF por Ação'])
+    fluxo = np.where(fcf > 0, fcf, lpa)[:, None]
+    dividendo = _arr(df['Dividendo por Ação'])[:, None]
+    v_graham = graham(lpa, _arr(df['VPA']))[:, None]  # não depende das premissas
+    preco = _arr(df['Preço Atual'])
+
+    percentis = np.full((len(df), 3), np.nan)
+    prob_acima = np.full(len(df), np.nan)
+    # Em blocos de tickers para limitar a memória (bloco × simulações)
+    for inicio in range(0, len(df), bloco):
+        fatia = slice(inicio, inicio + bloco)
+        metodos = np.stack(np.broadcast_arrays(
+            v_graham[fatia],
+            gordon(dividendo[fatia], k, gp),
+            dcf(fluxo[fatia], k, g, gp, p['anos']),
+        )).astype('float32')
+        distribuicao = np.sort(_mediana_metodos(metodos), axis=1)
+        validos = (~np.isnan(distribuicao)).sum(axis=1)
+        percentis[fatia] = _percentis(distribuicao, validos, [0.05, 0.5, 0.95])
+        acima = (distribuicao > preco[fatia, None]).sum(axis=1)
+        prob_acima[fatia] = np.where(validos > 0, acima / np.maximum(validos, 1), np.nan)
+
+    return pd.DataFrame({
+        'Ticker': df['Ticker'].to_numpy(),
+        'Preço Atual': preco,
+        'Preço Justo P5': percentis[:, 0].round(2),
+        'Preço Justo P50': percentis[:, 1].round(2),
+        'Preço Justo P95': percentis[:, 2].round(2),
+        'Prob. Acima do Preço (%)': (prob_acima * 100).round(1),
+    })
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Preço justo (Graham, Gordon, DCF) com sensibilidade Monte Carlo")
+    parser.add_argument('entrada', nargs='?', default='./dados/acoes.csv', help="CSV/Parquet com LPA, VPA, Dividendo por Ação, FCF por Ação")
+    parser.add_argument('--simulacoes', type=int, default=10_000)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--saida', default='./relatorios/valor_justo.csv')
+    args = parser.parse_args()
+
+    df = pd.read_parquet(args.entrada) if args.entrada.endswith('.parquet') else pd.read_csv(args.entrada)
+    faltando = [c for c in COLUNAS_NECESSARIAS if c not in df.columns]
+    if faltando:
+        raise SystemExit(f"❌ {args.entrada} não tem as colunas {', '.join(faltando)}. "
+                         "Gere o arquivo com o screener (python screener.py), que coleta esses campos.")
+    resultado = calcular_valor_justo(df)
+    simulacao = simular_valor_justo(resultado, args.simulacoes, semente=args.semente)
+    resultado = resultado.merge(simulacao.drop(columns=['Preço Atual']), on='Ticker', how='left')
+
+    if args.saida.endswith('.parquet'):
+        resultado.to_parquet(args.saida, index=False)
+    else:
+        resultado.to_csv(args.saida, index=False)
+    print(resultado[['Ticker', 'Preço Atual', 'Graham', 'Gordon', 'DCF', 'Preço Justo', 'Preço Justo P5', 'Preço Justo P95']])
+    print(f"\n✅ Salvo em {args.saida}")